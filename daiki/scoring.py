@@ -2,6 +2,67 @@ import math
 import numpy as np
 
 
+def debt_schedule(
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    horizon: int = 12,
+) -> np.ndarray:
+    """
+    Deterministic month-by-month required payment for every debt.
+
+    Debt balances evolve independently of the simulated cash path, so the
+    schedule is computed once per call and shared by all Monte Carlo trials.
+
+    Parameters
+    ----------
+    d, p, t, r : Debt balances, fixed payments, terms and monthly rates, as
+                 described in prob_default_12m.
+    horizon    : Number of months to schedule (default 12).
+
+    Returns
+    -------
+    np.ndarray : Shape (k, horizon); entry [i, m - 1] is the payment (or
+                 balloon) required on debt i in month m.
+    """
+    k = len(d)
+    if not (len(p) == len(t) == len(r) == k):
+        raise ValueError("d, p, t, and r must all have the same length.")
+
+    bal = np.array(d, dtype=float)
+    p = np.array(p, dtype=float)
+    t = np.array(t, dtype=float)   # may contain math.inf
+    r = np.array(r, dtype=float)
+
+    required = np.zeros((k, horizon))
+
+    for m in range(1, horizon + 1):
+        # --- accrue interest on positive balances ---
+        bal += bal * r * (bal > 0)
+
+        # A debt requires payment while m <= t[i] AND balance > 0.
+        within_term = (m <= t)          # (k,)
+        has_balance = bal > 1e-9        # (k,)
+
+        # Normal scheduled payment (capped at remaining balance)
+        scheduled = np.minimum(p, bal)
+        scheduled = np.where(within_term & has_balance, scheduled, 0.0)
+
+        # Balloon payment: if m == t[i] (last scheduled month) pay off
+        # any residual balance that the fixed payment didn't cover.
+        is_last_month = (m == t)        # (k,)
+        residual = np.where(is_last_month & has_balance, bal - scheduled, 0.0)
+
+        required[:, m - 1] = scheduled + residual
+
+        # --- reduce debt balances by payments made ---
+        bal -= scheduled + residual
+        bal = np.maximum(bal, 0.0)    # prevent floating-point negatives
+
+    return required
+
+
 def prob_default_12m(
     mu_I: float,
     mu_E: float,
@@ -67,10 +128,10 @@ def prob_default_12m(
     if N <= 0:
         raise ValueError("N must be a positive integer.")
 
-    d = np.array(d, dtype=float)
-    p = np.array(p, dtype=float)
-    t = np.array(t, dtype=float)   # may contain math.inf
-    r = np.array(r, dtype=float)
+    # ------------------------------------------------------------------ #
+    # Debt schedule is deterministic: compute it once, not once per trial
+    # ------------------------------------------------------------------ #
+    required = debt_schedule(d, p, t, r).sum(axis=0)   # (12,)
 
     sigma_I = math.sqrt(var_I)
     sigma_E = math.sqrt(var_E)
@@ -93,51 +154,12 @@ def prob_default_12m(
     net_cash_flow = income - expenses   # (N, 12)
 
     # ------------------------------------------------------------------ #
-    # Simulate month-by-month (vectorised over all N trials at once)
+    # Cash balance after each month: B0 + cumulative (net - required)
     # ------------------------------------------------------------------ #
-    B   = np.full(N, B0, dtype=float)        # cash balances
-    bal = np.tile(d, (N, 1))                 # debt balances: (N, k)
-
-    # Track which trials have already defaulted so we stop updating them.
-    defaulted = np.zeros(N, dtype=bool)
-
-    for m in range(1, 13):
-        # Skip fully defaulted trials
-        active = ~defaulted
-
-        # --- accrue interest on positive balances ---
-        positive = bal > 0                                    # (N, k)
-        bal[active] += (bal * r)[active] * positive[active]  # only positive balances
-
-        # --- determine required payment for each debt this month ---
-        # A debt requires payment while m <= t[i] AND balance > 0.
-        within_term = (m <= t)          # (k,) broadcast across all trials
-        has_balance = bal > 1e-9        # (N, k)
-
-        # Normal scheduled payment (capped at remaining balance)
-        scheduled = np.minimum(p, bal)                           # (N, k)
-        scheduled = np.where(within_term & has_balance, scheduled, 0.0)
-
-        # Balloon payment: if m == t[i] (last scheduled month) pay off
-        # any residual balance that the fixed payment didn't cover.
-        # This fixes the "interest accrues silently after term" bug.
-        is_last_month = (m == t)        # (k,)
-        residual = np.where(is_last_month & has_balance, bal - scheduled, 0.0)
-
-        # Total required outflow
-        total_required = scheduled.sum(axis=1) + residual.sum(axis=1)   # (N,)
+    B = B0 + np.cumsum(net_cash_flow - required, axis=1)   # (N, 12)
 
-        # --- update cash ---
-        B[active] += net_cash_flow[active, m - 1]
-        B[active] -= total_required[active]
-
-        # --- record new defaults ---
-        defaulted |= (B < 0)
-
-        # --- reduce debt balances by payments made ---
-        payments_made = scheduled + residual                    # (N, k)
-        bal -= payments_made
-        bal = np.maximum(bal, 0.0)    # prevent floating-point negatives
+    # A trial defaults if its balance dips below zero in any month.
+    defaulted = (B < 0).any(axis=1)
 
     return float(defaulted.sum()) / N
 
@@ -29,16 +29,20 @@ async function doSyncProfile(userName, apiBase) {
   if (!userName) return { ok: false, reason: 'no_user' };
   const base = (apiBase || 'http://localhost:8000').replace(/\/$/, '');
   try {
-    const [userRes, scoreRes] = await Promise.all([
-      fetch(`${base}/user/${encodeURIComponent(userName)}`),
-      fetch(`${base}/score/${encodeURIComponent(userName)}`),
-    ]);
-    if (!userRes.ok || !scoreRes.ok) return { ok: false, reason: 'api_error' };
-    const userData  = await userRes.json();
-    const scoreData = await scoreRes.json();
+    // One conditional request: 304 means the stored profile is still current
+    const stored = (await chrome.storage.local.get(STORAGE.PROFILE))[STORAGE.PROFILE];
+    const headers = stored?.etag ? { 'If-None-Match': stored.etag } : {};
+    const res = await fetch(`${base}/profile/${encodeURIComponent(userName)}`, { headers });
+    if (res.status === 304 && stored) {
+      const profile = { ...stored, synced_at: Date.now() };
+      await chrome.storage.local.set({ [STORAGE.PROFILE]: profile });
+      return { ok: true, profile };
+    }
+    if (!res.ok) return { ok: false, reason: 'api_error' };
+    const { user: userData, shield_score, impact_table } = await res.json();
     const monthly_net = Math.max(0, (userData.average_income || 0) - (userData.average_expenses || 0));
     const profile = {
-      score:       scoreData.shield_score,
+      score:       shield_score,
       income:      userData.average_income   || 0,
       expenses:    userData.average_expenses || 0,
       monthly_net,
@@ -46,6 +50,8 @@ async function doSyncProfile(userName, apiBase) {
       goals:       (userData.savings_goals || []).map((g, i) => ({
         name: g.name, target: g.target_amount, priority: g.priority ?? (i + 1),
       })),
+      impact_table: impact_table || null,
+      etag:      res.headers.get('ETag'),
       synced_at: Date.now(),
     };
     await chrome.storage.local.set({ [STORAGE.PROFILE]: profile });
@@ -168,6 +174,22 @@ chrome.runtime.onMessage.addListener((msg, sender, sendResponse) => {
         break;
       }
 
+      case 'SIMULATE_PURCHASE': {
+        const settingsData = await chrome.storage.local.get(STORAGE.SETTINGS);
+        const settings = settingsData[STORAGE.SETTINGS] || DEFAULTS;
+        if (!settings.userName) { sendResponse({ ok: false, reason: 'no_user' }); break; }
+        const base = (settings.apiBase || 'http://localhost:8000').replace(/\/$/, '');
+        try {
+          const res = await fetch(
+            `${base}/simulate/${encodeURIComponent(settings.userName)}?purchase_amount=${encodeURIComponent(msg.amount)}`,
+            { method: 'POST' });
+          sendResponse(res.ok ? { ok: true, impact: await res.json() } : { ok: false, reason: 'api_error' });
+        } catch (e) {
+          sendResponse({ ok: false, reason: 'fetch_error', error: e.message });
+        }
+        break;
+      }
+
       case 'UPDATE_SETTINGS': {
         const current = (await chrome.storage.local.get(STORAGE.SETTINGS))[STORAGE.SETTINGS] || DEFAULTS;
         await chrome.storage.local.set({ [STORAGE.SETTINGS]: { ...current, ...msg.settings } });
@@ -509,6 +509,10 @@
               <div class="ds-goals-header">Goals Timeline</div>
               <div id="ds-goals-list"></div>
             </div>
+            <div id="ds-finance-section" style="display:none">
+              <div class="ds-goals-header">Ways to Pay</div>
+              <div id="ds-finance-list"></div>
+            </div>
           </div>
           <div id="ds-tabs">
             <button class="ds-tab active" data-tab="reflect">🤔 Reflect</button>
@@ -1327,7 +1331,8 @@
   }
 
   // ── IMPACT ANALYSIS ──────────────────────────────────────────
-  function computeImpact(amount, profile) {
+  // Rough local estimate: shown instantly, and kept if the API is unreachable
+  function estimateImpact(amount, profile) {
     if (!profile || !amount) return null;
     const mn = Math.max(profile.monthly_net || 0, 50);
     const score = profile.score || 0;
@@ -1352,11 +1357,64 @@
     return { score, score_delta, projected_score: projected, goals_impact };
   }
 
-  function renderImpactSection(amount, profile) {
+  // Precomputed model values synced with the profile (see /profile): score
+  // and goal delays on a log-spaced amount grid, so the cell is one log away
+  const IMPACT_TABLE_VERSION = 1;
+
+  function lookupImpact(amount, profile) {
+    const t = profile.impact_table;
+    if (!t || t.version !== IMPACT_TABLE_VERSION || !(t.amounts?.length > 1)) return null;
+
+    const a = t.amounts, n = a.length;
+    const score = profile.score ?? t.base_score;
+    let projected, cell;
+    if (amount <= a[0]) {
+      projected = t.base_score + (t.shield_score[0] - t.base_score) * (amount / a[0]);
+      cell = 0;
+    } else {
+      const pos = Math.min(n - 1, Math.log(amount / a[0]) / (Math.log(a[n - 1] / a[0]) / (n - 1)));
+      const i = Math.min(n - 2, Math.floor(pos)), f = pos - i;
+      projected = t.shield_score[i] + (t.shield_score[i + 1] - t.shield_score[i]) * f;
+      cell = Math.ceil(pos);   // round goal delays up to the next grid amount
+    }
+
+    const score_delta = projected - t.base_score;
+    const goals_impact = (t.goals || []).slice(0, 3).map(g => ({
+      name: g.name, base_months: g.base_months, delay_months: g.delay_months[cell],
+    }));
+    return {
+      score, score_delta,
+      projected_score: Math.max(0, Math.min(100, score + score_delta)),
+      goals_impact,
+    };
+  }
+
+  // With the server's /simulate result the headline is paying from savings,
+  // and every financing option is listed with its own score delta
+  function computeImpact(amount, profile, server) {
+    if (!profile || !amount) return null;
+    if (!server?.options) return lookupImpact(amount, profile) || estimateImpact(amount, profile);
+
+    const score = profile.score ?? server.shield_score;
+    const pay   = server.options.find(o => o.option === 'savings') || server.options[0];
+    const projected = Math.max(0, Math.min(100, score + pay.score_delta));
+    const goals_impact = pay.goals.slice(0, 3).map(g => ({
+      name: g.name, base_months: g.base_months, delay_months: g.delay_months,
+    }));
+    return { score, score_delta: pay.score_delta, projected_score: projected, goals_impact, options: server.options };
+  }
+
+  async function fetchImpact(amount) {
+    const res = await safeSend({ type: 'SIMULATE_PURCHASE', amount });
+    if (!res?.ok || state.currentAmount !== amount) return;
+    renderImpactSection(amount, state.profile, res.impact);
+  }
+
+  function renderImpactSection(amount, profile, server) {
     const section = document.getElementById('ds-impact-section');
     if (!section) return;
 
-    const impact = computeImpact(amount, profile);
+    const impact = computeImpact(amount, profile, server);
     if (!impact) { section.style.display = 'none'; return; }
 
     section.style.display = 'block';
@@ -1390,6 +1448,13 @@
               <span class="ds-goal-time ds-goal-warn">No surplus to save</span>
             </div>`;
           }
+          if (g.delay_months === null) {
+            return `<div class="ds-goal-row">
+              <span class="ds-goal-name">${g.name}</span>
+              <span class="ds-goal-time">${g.base_months} mo <span class="ds-goal-arrow">→</span> 20+ yrs</span>
+              <span class="ds-goal-delay ds-goal-bad">Out of reach</span>
+            </div>`;
+          }
           const after = g.base_months + g.delay_months;
           const sign  = g.delay_months > 0 ? `+${g.delay_months} mo` : '—';
           const cls   = g.delay_months >= 3 ? 'ds-goal-bad' : g.delay_months >= 1 ? 'ds-goal-warn' : '';
@@ -1401,6 +1466,25 @@
         }).join('');
       }
     }
+
+    const financeSection = document.getElementById('ds-finance-section');
+    const financeList    = document.getElementById('ds-finance-list');
+    if (financeSection && financeList) {
+      financeSection.style.display = impact.options ? 'block' : 'none';
+      if (impact.options) {
+        const c = state.settings?.currency || '£';
+        financeList.innerHTML = impact.options.map(o => {
+          const sign = o.score_delta > 0 ? '+' : '';
+          const cls  = o.score_delta <= -8 ? 'ds-goal-bad' : o.score_delta <= -3 ? 'ds-goal-warn' : '';
+          const cost = o.monthly_payment > 0 ? `${c}${o.monthly_payment.toFixed(0)}/mo · ${c}${o.total_cost.toFixed(0)} total` : `${c}${o.total_cost.toFixed(0)} now`;
+          return `<div class="ds-goal-row">
+            <span class="ds-goal-name">${o.label}</span>
+            <span class="ds-goal-time">${cost}</span>
+            <span class="ds-goal-delay ${cls}">${sign}${o.score_delta.toFixed(1)} pts</span>
+          </div>`;
+        }).join('');
+      }
+    }
   }
 
   function _showMainModal(amount, risk) {
@@ -1435,8 +1519,9 @@
     leftEl.className  = 'ds-ctx-val' + (left / budget < 0.2 ? ' ds-danger' : left / budget < 0.4 ? ' ds-warn' : '');
     afterEl.className = 'ds-ctx-val' + (afterThis <= 0 ? ' ds-danger' : afterThis < budget * 0.1 ? ' ds-warn' : '');
 
-    // Render shield impact section
+    // Render shield impact section: local estimate now, server result when it arrives
     renderImpactSection(amount, state.profile);
+    if (amount) fetchImpact(amount);
 
     document.querySelectorAll('.ds-tab').forEach((t,i) => t.classList.toggle('active', i===0));
     document.querySelectorAll('.ds-tab-pane').forEach((p,i) => p.classList.toggle('active', i===0));
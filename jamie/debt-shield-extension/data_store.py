@@ -2,14 +2,23 @@
 Persistent data store — survives uvicorn --reload.
 Users are written to debt_shield_users.json next to this file so the
 in-memory dict is always warm after any hot-reload.
+
+Purchase impact tables are several times larger than a user record, so
+each lives in its own file under debt_shield_tables/ and saving one never
+rewrites the user store.
 """
+import hashlib
 import json
 from pathlib import Path
 
 _STORE_PATH = Path(__file__).parent / "debt_shield_users.json"
+_TABLE_DIR  = Path(__file__).parent / "debt_shield_tables"
 
 _cache: dict = {}
 
+# Called with the user's name after every save (e.g. to drop cached scores)
+_save_listeners: list = []
+
 
 def _load() -> None:
     global _cache
@@ -36,6 +45,94 @@ def save_user(user) -> None:
     """Persist a UserOnboarding (Pydantic model) by name."""
     _cache[user.name] = user.model_dump()
     _flush()
+    for listener in _save_listeners:
+        listener(user.name)
+
+
+def save_users(users) -> None:
+    """Persist many users with a single write of the store file."""
+    for user in users:
+        _cache[user.name] = user.model_dump()
+    _flush()
+    for user in users:
+        for listener in _save_listeners:
+            listener(user.name)
+
+
+def on_save(listener) -> None:
+    """Register listener(name) to run whenever a user is saved."""
+    _save_listeners.append(listener)
+
+
+def save_score(name: str, score: dict) -> None:
+    """Attach a precomputed score record to a stored user (no-op if unknown)."""
+    if name in _cache:
+        _cache[name]["stored_score"] = score
+        _flush()
+
+
+def save_scores(scores: dict) -> None:
+    """Attach score records (name -> record) to stored users in one write."""
+    for name, score in scores.items():
+        if name in _cache:
+            _cache[name]["stored_score"] = score
+    _flush()
+
+
+def get_stored_score(name: str):
+    """Return the score record stored with a user, or None."""
+    _load()
+    return _cache.get(name, {}).get("stored_score")
+
+
+def get_stored_scores(names) -> dict:
+    """Score records by name for the given users, read in one pass."""
+    _load()
+    return {name: _cache[name]["stored_score"]
+            for name in names if "stored_score" in _cache.get(name, {})}
+
+
+def _table_path(name: str) -> Path:
+    # Hash the name so any user name makes a safe file name
+    return _TABLE_DIR / (hashlib.sha256(name.encode("utf-8")).hexdigest()[:32] + ".json")
+
+
+def save_table(name: str, table_key: str, table: dict) -> None:
+    """Store a user's impact table under the key it was computed for."""
+    _TABLE_DIR.mkdir(exist_ok=True)
+    path = _table_path(name)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"table_key": table_key, "impact_table": table}), encoding="utf-8")
+    tmp.replace(path)
+
+
+def save_tables(tables: dict) -> None:
+    """Store impact tables (name -> (table_key, table)) for many users."""
+    for name, (table_key, table) in tables.items():
+        save_table(name, table_key, table)
+
+
+def get_table(name: str, table_key: str):
+    """Return the user's stored impact table if it was computed for table_key, else None."""
+    try:
+        stored = json.loads(_table_path(name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return stored["impact_table"] if stored.get("table_key") == table_key else None
+
+
+def get_users(names=None) -> dict:
+    """UserOnboarding instances by name, read in one pass (all users if names is None)."""
+    _load()
+    from models import UserOnboarding
+    names = list(_cache) if names is None else names
+    return {name: UserOnboarding(**_cache[name]) for name in names if name in _cache}
+
+
+def list_users() -> list:
+    """Names of every stored user."""
+    _load()
+    return list(_cache)
 
 
 def get_user(name: str):
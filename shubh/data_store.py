@@ -1,8 +1,54 @@
 # Simple in-memory storage for hackathon
 user_data_store = {}
+score_store = {}
+table_store = {}
+
+# Called with the user's name after every save (e.g. to drop cached scores)
+_save_listeners = []
 
 def save_user(user):
     user_data_store[user.name] = user
+    for listener in _save_listeners:
+        listener(user.name)
+
+def save_users(users):
+    for user in users:
+        save_user(user)
+
+def on_save(listener):
+    _save_listeners.append(listener)
+
+def save_score(name, score):
+    if name in user_data_store:
+        score_store[name] = score
+
+def save_scores(scores):
+    for name, score in scores.items():
+        save_score(name, score)
+
+def get_stored_score(name):
+    return score_store.get(name)
+
+def get_stored_scores(names):
+    return {name: score_store[name] for name in names if name in score_store}
+
+def save_table(name, table_key, table):
+    table_store[name] = (table_key, table)
+
+def save_tables(tables):
+    for name, (table_key, table) in tables.items():
+        save_table(name, table_key, table)
+
+def get_table(name, table_key):
+    stored = table_store.get(name)
+    return stored[1] if stored and stored[0] == table_key else None
+
+def get_users(names=None):
+    names = list(user_data_store) if names is None else names
+    return {name: user_data_store[name] for name in names if name in user_data_store}
+
+def list_users():
+    return list(user_data_store)
 
 def get_user(name):
     return user_data_store.get(name)
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Shared pool of standard-normal draws for the Monte Carlo scorer.
+
+Every score request with the same (N, horizon, seed) consumes exactly the
+same draws, so they are generated once, saved as an .npy file and memory-
+mapped read-only by each uvicorn worker. The OS page cache then holds a
+single physical copy shared by all workers, and requests skip both the RNG
+and the allocation.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+
+_POOL_DIR = Path(os.environ.get("DEBT_SHIELD_POOL_DIR", Path(__file__).parent / "draw_pool"))
+
+_attached: dict = {}
+
+
+def _pool_path(N: int, horizon: int, seed: int) -> Path:
+    return _POOL_DIR / f"normals_{N}x{horizon}x2_seed{seed}.npy"
+
+
+def build(N: int, horizon: int = 12, seed: int = 42) -> Path:
+    """Write the pool file for this key if it does not exist yet."""
+    path = _pool_path(N, horizon, seed)
+    if not path.exists():
+        _POOL_DIR.mkdir(parents=True, exist_ok=True)
+        Z = np.random.default_rng(seed).standard_normal((N, horizon, 2))
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as fh:
+            np.save(fh, Z)
+        tmp.replace(path)   # atomic, so racing workers never see a partial file
+    return path
+
+
+def attach(N: int, horizon: int = 12, seed: int = 42) -> np.ndarray:
+    """Memory-map the pool for this key (building it first if needed)."""
+    key = (N, horizon, seed)
+    if key not in _attached:
+        _attached[key] = np.load(build(N, horizon, seed), mmap_mode="r")
+    return _attached[key]
+
+
+def get(N: int, horizon: int = 12, seed: int = 42):
+    """
+    Return the attached (N, horizon, 2) read-only draws, or None if this
+    process has not attached that key. The array is identical to
+    np.random.default_rng(seed).standard_normal((N, horizon, 2)).
+    """
+    return _attached.get((N, horizon, seed))
@@ -1,27 +1,229 @@
+import asyncio
+import json
+import logging
 import math
-from fastapi import FastAPI, HTTPException
+import os
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import List, Optional
+import numpy as np
+from fastapi import BackgroundTasks, Body, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from models import UserOnboarding
-from data_store import save_user, get_user
-from simulation import simulate_purchase
-from scoring import shield_score
+from models import UserOnboarding, ScoreScenario, RepaymentRequest
+from data_store import (
+    save_user, save_users, get_user, get_users, on_save,
+    save_score, save_scores, get_stored_score, get_stored_scores,
+    save_table, save_tables, get_table,
+)
+from simulation import (
+    IMPACT_N, IMPACT_TABLE_VERSION, impact_amounts, impact_table, impact_table_from_scores,
+    purchase_impact,
+)
+from scoring import (
+    MODEL_VERSION, shield_score, prob_default_12m, prob_default_12m_adaptive, score_from_prob, aggregate_instalments,
+    ScoreSurface, Scenario, shield_score_batch, default_curve, debt_attribution,
+    pad_debts, prob_default_cohort, shard_defaults, shard_jobs, wilson_interval,
+)
+from repayment import optimise_repayment
+from score_cache import ScoreCache, input_key
+import draw_pool
+
+logger = logging.getLogger(__name__)
+
+SCORE_N    = 200_000
+SCORE_SEED = 42
+
+# APR (%) assumed for putting a purchase on a card when the user has no
+# credit-card debt on file; matches onboarding's Credit Card default.
+DEFAULT_CARD_APR = 24.6
+
+# Precision tiers for /score?budget_ms=..., best first. When the predicted
+# queue wait plus simulation time of every tier misses the budget, the
+# deterministic quadrature engine is used in-process instead.
+SCORE_TIERS = (("full", SCORE_N), ("reduced", 50_000), ("coarse", 12_500))
+
+# Paths per block for long-horizon simulations, so memory does not grow
+# with N x horizon
+SCORE_BLOCK = 65_536
+
+# Largest scenario list /score/{name}/scenarios accepts per call
+MAX_SCENARIOS = 64
+
+# Bulk scoring splits users into cohort-kernel jobs of at least this many
+COHORT_MIN_CHUNK = 64
+
+# /score/{name}/stream: the first estimate comes from STREAM_FIRST_BATCH
+# paths, then each stage doubles the paths used, split across the scoring
+# workers in shards of at most STREAM_SHARD paths.
+STREAM_FIRST_BATCH = 10_000
+STREAM_SHARD       = 262_144
+STREAM_MAX_N       = 20_000_000
+
+# Scoring runs in its own worker processes so the event loop and the
+# threadpool stay free for cheap requests; beyond SCORE_QUEUE_DEPTH pending
+# jobs /score answers 503 instead of queueing without bound.
+SCORE_WORKERS     = int(os.environ.get("DEBT_SHIELD_SCORE_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+SCORE_QUEUE_DEPTH = int(os.environ.get("DEBT_SHIELD_SCORE_QUEUE_DEPTH", 4 * SCORE_WORKERS))
 
-app = FastAPI()
+# Seconds between sweeps that recompute stored scores left stale by a
+# profile change or a MODEL_VERSION bump.
+SCORE_REFRESH_INTERVAL = float(os.environ.get("DEBT_SHIELD_SCORE_REFRESH_INTERVAL", 300))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refresher = asyncio.create_task(_refresh_stale_scores())
+    yield
+    refresher.cancel()
+    _shutdown_score_executor()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+def _attach_draw_pools() -> None:
+    """
+    Map the shared on-disk draws for the default score (SCORE_N) and
+    /simulate (IMPACT_N). Runs here and as the scoring-pool initializer, so
+    workers have both pools whatever the process start method.
+    """
+    draw_pool.attach(SCORE_N)
+    draw_pool.attach(IMPACT_N)
+
+
+_attach_draw_pools()
+
+# Repeat /score calls for an unchanged profile are served from memory;
+# saving a user drops their entries.
+score_cache = ScoreCache(maxsize=int(os.environ.get("DEBT_SHIELD_SCORE_CACHE_SIZE", 4096)))
+on_save(score_cache.invalidate)
+
+_score_executor: Optional[ProcessPoolExecutor] = None
+_score_jobs = 0     # submitted to the pool and not yet finished
+
+
+def _get_score_executor() -> ProcessPoolExecutor:
+    global _score_executor
+    if _score_executor is None:
+        _score_executor = ProcessPoolExecutor(
+            max_workers=SCORE_WORKERS, initializer=_attach_draw_pools)
+    return _score_executor
+
+
+def _shutdown_score_executor():
+    global _score_executor
+    if _score_executor is not None:
+        _score_executor.shutdown(cancel_futures=True)
+        _score_executor = None
+
+
+def _timed(fn, *args):
+    """Run fn(*args) in a worker and report when it started and finished."""
+    started = time.time()
+    result  = fn(*args)
+    return result, started, time.time()
+
+
+def _run_scoring(fn, *args):
+    """
+    Queue fn(*args) on the scoring pool and return an awaitable of
+    (result, timing), where timing splits the wait for a free worker
+    (queue_ms) from the simulation itself (compute_ms).
+
+    The job is admitted (or refused with 503) before this returns, so the
+    queue depth seen by the next request already includes it.
+    """
+    global _score_jobs
+    if _score_jobs >= SCORE_QUEUE_DEPTH:
+        raise HTTPException(status_code=503, detail="Scoring queue is full, retry shortly",
+                            headers={"Retry-After": "1"})
+
+    _score_jobs += 1
+    submitted = time.time()
+    job = asyncio.get_running_loop().run_in_executor(_get_score_executor(), _timed, fn, *args)
+
+    async def wait() -> tuple:
+        global _score_jobs
+        try:
+            result, started, finished = await job
+        finally:
+            _score_jobs -= 1
+        return result, {
+            "queue_ms":   round(max(0.0, started - submitted) * 1000, 1),
+            "compute_ms": round((finished - started) * 1000, 1),
+        }
+
+    return wait()
+
+
+# Running averages used to predict queue wait and simulation time
+_score_load = {"job_ms": 120.0, "ms_per_path": 0.0006}
+
+
+def _record_load(timing: dict, n_paths: int) -> None:
+    _score_load["job_ms"]      += 0.2 * (timing["compute_ms"] - _score_load["job_ms"])
+    _score_load["ms_per_path"] += 0.2 * (timing["compute_ms"] / n_paths - _score_load["ms_per_path"])
+
+
+_inflight: dict = {}    # input key -> task computing that score
+
+
+async def _score_once(name: str, key: str, fn, *args) -> tuple:
+    """
+    Compute and cache the score for `key`, sharing one computation between
+    concurrent callers with the same key.
+
+    Returns (result, timing, shared) where shared is True for callers that
+    joined a computation another request had already started.
+    """
+    task = _inflight.get(key)
+    shared = task is not None
+    if not shared:
+        job = _run_scoring(fn, *args)
+
+        async def compute():
+            result, timing = await job
+            score_cache.put(name, key, result)
+            return result, timing
+
+        task = asyncio.ensure_future(compute())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # shield: one caller disconnecting must not cancel the others' result
+    result, timing = await asyncio.shield(task)
+    return result, timing, shared
+
 
 @app.post("/onboard/")
-def onboard_user(user: UserOnboarding):
+def onboard_user(user: UserOnboarding, background_tasks: BackgroundTasks):
+    user.bnpl_plans = _compact_bnpl(user.bnpl_plans)
     save_user(user)
+    # Score now, off the request path, so the first /score is already stored
+    background_tasks.add_task(_refresh_score, user.name)
     return {"message": f"Onboarding complete for {user.name}", "data": user}
 
 
+@app.post("/onboard/batch")
+def onboard_users(users: List[UserOnboarding], background_tasks: BackgroundTasks):
+    """Onboard many users with one store write; they are scored in the background."""
+    for user in users:
+        user.bnpl_plans = _compact_bnpl(user.bnpl_plans)
+    save_users(users)
+    background_tasks.add_task(_bulk_scores, get_users([user.name for user in users]), wait=True)
+    return {"message": f"Onboarding complete for {len(users)} users", "count": len(users)}
+
+
 @app.get("/user/{name}")
 def get_user_data(name: str):
     user = get_user(name)
@@ -30,39 +232,106 @@ def get_user_data(name: str):
     return user
 
 
+def _compute_impact(params: dict, amount: float, card_apr: float,
+                    monthly_saving: float, goals: list) -> dict:
+    """The /simulate computation; runs inside a scoring worker process."""
+    return purchase_impact(params, amount, card_apr, monthly_saving, goals, seed=SCORE_SEED)
+
+
 @app.post("/simulate/{name}")
-def simulate(name: str, purchase_amount: float):
-    user = get_user(name)
+async def simulate(name: str, purchase_amount: float, card_apr: Optional[float] = None):
+    """
+    Impact of a purchase paid from savings, on a credit card or as a
+    3/6/12-instalment BNPL plan: score deltas and goal-ETA shifts, all
+    options scored on the same simulated paths.
+    """
+    user = await asyncio.to_thread(get_user, name)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    result = simulate_purchase(user, purchase_amount)
-    return result
 
+    if card_apr is None:
+        card_aprs = [debt.apr for debt in user.debts if "card" in debt.category.lower()]
+        card_apr = max(card_aprs) if card_aprs else DEFAULT_CARD_APR
 
-@app.get("/score/{name}")
-def get_score(name: str):
-    user = get_user(name)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    monthly_saving, goals = _goal_inputs(user)
+
+    try:
+        result, _ = await _run_scoring(_compute_impact, _score_params(user), purchase_amount,
+                                       card_apr, monthly_saving, goals)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"name": user.name, "amount": purchase_amount, **result}
+
+
+def _bnpl_streams(bnpl_plans) -> tuple[list, list, list, list]:
+    """BNPL plans → one (d, p, t, r) stream per distinct number of instalments left."""
+    return aggregate_instalments(
+        [(plan.instalment_amount * plan.count, plan.instalments_remaining) for plan in bnpl_plans])
 
-    # --- Build debt parameter lists ---
+
+def _debt_lists(debts, bnpl_plans=()) -> tuple[list, list, list, list]:
+    """Debt records (and BNPL plans) → the d/p/t/r lists used by the scoring engine."""
     # Use math.inf for indefinite debts; convert APR % to monthly rate
     d_list, p_list, t_list, r_list = [], [], [], []
-    for debt in user.debts:
+    for debt in debts:
         d_list.append(debt.total_amount)
         p_list.append(debt.monthly_payment)
         t_list.append(math.inf if debt.months_remaining is None else float(debt.months_remaining))
         r_list.append(debt.apr / 100 / 12)   # APR % → monthly decimal rate
 
+    # BNPL plans with the same number of instalments left share one stream
+    bnpl_d, bnpl_p, bnpl_t, bnpl_r = _bnpl_streams(bnpl_plans)
+    d_list += bnpl_d
+    p_list += bnpl_p
+    t_list += bnpl_t
+    r_list += bnpl_r
+
     # If the user has no debts, use a single dummy zero-balance entry
     if not d_list:
         d_list, p_list, t_list, r_list = [0.0], [0.0], [math.inf], [0.0]
 
+    return d_list, p_list, t_list, r_list
+
+
+def _debt_labels(user) -> list[str]:
+    """Labels for the scoring debts of _score_params(user), in the same order."""
+    _, _, bnpl_terms, _ = _bnpl_streams(user.bnpl_plans)
+    return [debt.label for debt in user.debts] + [
+        f"BNPL plans ({int(n)} instalments left)" for n in bnpl_terms]
+
+
+def _compact_bnpl(plans) -> list:
+    """Merge BNPL plans with the same provider, instalment and term into one record."""
+    merged: dict = {}
+    for plan in plans:
+        key = (plan.provider, plan.instalment_amount, plan.instalments_remaining)
+        if key in merged:
+            merged[key].count += plan.count
+        else:
+            merged[key] = plan.model_copy()
+    return list(merged.values())
+
+
+def _goal_inputs(user) -> tuple[float, list]:
+    """Monthly amount saved towards goals, and (name, remaining) per goal by priority."""
+    surplus = max(0.0, user.average_income - user.average_expenses)
+    goals = sorted(user.savings_goals, key=lambda g: g.priority)
+    return (surplus * user.savings_allocation_pct / 100,
+            [(g.name, max(0.0, g.target_amount - user.current_savings)) for g in goals])
+
+
+def _score_params(user) -> dict:
+    """Scoring-engine inputs (mu_I .. B0) derived from a UserOnboarding record."""
+    d_list, p_list, t_list, r_list = _debt_lists(user.debts, user.bnpl_plans)
+
     # --- Adjust expenses to exclude debt payments (avoid double-counting) ---
     # The user's average_expenses is INCLUSIVE of debt payments (as entered/derived
     # from their CSV). The simulation accounts for debt payments separately via p[],
     # so we strip them out of mu_E here.
-    total_monthly_debt = sum(debt.monthly_payment for debt in user.debts)
+    # Only the BNPL streams that are actually scored are stripped out.
+    total_monthly_debt = (sum(debt.monthly_payment for debt in user.debts)
+                          + sum(_bnpl_streams(user.bnpl_plans)[1]))
     adjusted_expenses  = max(0.0, user.average_expenses - total_monthly_debt)
 
     # --- Variance: use CSV-derived values if available, else ±20% heuristic ---
@@ -79,17 +348,603 @@ def get_score(name: str):
     else:
         var_E = (adjusted_expenses * 0.20) ** 2
 
-    score = shield_score(
-        mu_I  = user.average_income,
-        mu_E  = adjusted_expenses,
-        var_I = var_I,
-        var_E = var_E,
-        d     = d_list,
-        p     = p_list,
-        t     = t_list,
-        r     = r_list,
-        B0    = user.current_savings,
-        N     = 200_000,
-    )
-
-    return {"name": user.name, "shield_score": score}
\ No newline at end of file
+    return {
+        "mu_I":  user.average_income,
+        "mu_E":  adjusted_expenses,
+        "var_I": var_I,
+        "var_E": var_E,
+        "d":     d_list,
+        "p":     p_list,
+        "t":     t_list,
+        "r":     r_list,
+        "B0":    user.current_savings,
+    }
+
+
+def _compute_score(params: dict, method: str, tol: float,
+                   variance_reduction: Optional[str]) -> dict:
+    """The /score computation; runs inside a scoring worker process."""
+    if method == "adaptive":
+        est = prob_default_12m_adaptive(**params, tol=tol, max_N=SCORE_N, seed=SCORE_SEED)
+        return {
+            "shield_score": score_from_prob(est.prob),
+            "interval":     [score_from_prob(est.upper), score_from_prob(est.lower)],
+            "n_paths":      est.n_paths,
+        }
+    score = shield_score(**params, N=SCORE_N, seed=SCORE_SEED, method=method,
+                         variance_reduction=variance_reduction)
+    return {"shield_score": score}
+
+
+def _compute_tier(params: dict, N: int) -> dict:
+    """Plain Monte Carlo score on N paths with its standard error (score points)."""
+    prob = prob_default_12m(**params, N=N, seed=SCORE_SEED)
+    return {
+        "shield_score":   score_from_prob(prob),
+        "standard_error": round(100 * math.sqrt(prob * (1 - prob) / N), 3),
+        "n_paths":        N,
+    }
+
+
+def _full_tier(result: dict) -> dict:
+    """A default /score result labelled as the full tier, with its standard error."""
+    prob = 1 - result["shield_score"] / 100
+    return {"tier": "full", **result, "n_paths": SCORE_N,
+            "standard_error": round(100 * math.sqrt(prob * (1 - prob) / SCORE_N), 3)}
+
+
+def _score_key(params: dict, method: str = "monte_carlo", tol: float = 0.0025,
+               variance_reduction: Optional[str] = None, N: int = SCORE_N) -> str:
+    return input_key(params, N=N, seed=SCORE_SEED, model_version=MODEL_VERSION,
+                     method=method, tol=tol if method == "adaptive" else None,
+                     variance_reduction=variance_reduction)
+
+
+def _compute_impact_table(params: dict, monthly_saving: float, goals: list) -> dict:
+    """The extension's impact lookup table; runs inside a scoring worker process."""
+    return impact_table(params, monthly_saving, goals, N=SCORE_N, seed=SCORE_SEED)
+
+
+def _table_key(user, params: dict) -> str:
+    monthly_saving, goals = _goal_inputs(user)
+    return input_key(params, monthly_saving=monthly_saving, goals=goals, N=SCORE_N,
+                     seed=SCORE_SEED, model_version=MODEL_VERSION,
+                     table_version=IMPACT_TABLE_VERSION)
+
+
+async def _impact_table(user) -> dict:
+    """
+    The user's impact table: stored, cached, or computed on the scoring
+    pool. Tables are kept in the table store, apart from the user records,
+    under the key they were computed for.
+    """
+    params = _score_params(user)
+    table_key = _table_key(user, params)
+
+    table = await asyncio.to_thread(get_table, user.name, table_key)
+    if table is None:
+        table = score_cache.get(table_key)
+    if table is None:
+        table, _, _ = await _score_once(user.name, table_key, _compute_impact_table,
+                                        params, *_goal_inputs(user))
+        await asyncio.to_thread(save_table, user.name, table_key, table)
+    return table
+
+
+def _score_is_current(user, stored) -> bool:
+    """True when the stored record holds the user's current default score and impact table."""
+    if not stored:
+        return False
+    params = _score_params(user)
+    return (stored["input_key"] == _score_key(params)
+            and stored.get("table_key") == _table_key(user, params))
+
+
+async def _refresh_score(name: str) -> None:
+    """Compute and store the default score and impact table unless both are current."""
+    user = await asyncio.to_thread(get_user, name)
+    if user:
+        await _refresh_user(user, await asyncio.to_thread(get_stored_score, name))
+
+
+async def _refresh_user(user, stored) -> None:
+    """_refresh_score for a user record and its stored score, already loaded."""
+    if _score_is_current(user, stored):
+        return
+
+    name = user.name
+    params = _score_params(user)
+    key = _score_key(params)
+    table_key = _table_key(user, params)
+    try:
+        if stored and stored["input_key"] == key:
+            result = {"shield_score": stored["shield_score"]}
+        else:
+            result = score_cache.get(key) or (await _score_once(
+                name, key, _compute_score, params, "monte_carlo", 0.0, None))[0]
+        await _impact_table(user)
+    except HTTPException:
+        return      # queue full; the next sweep picks this user up again
+
+    await asyncio.to_thread(save_score, name, {
+        "shield_score":  result["shield_score"],
+        "input_key":     key,
+        "model_version": MODEL_VERSION,
+        "computed_at":   time.time(),
+        "table_key":     table_key,
+    })
+
+
+def _compute_cohort(params_list: list, goal_inputs: list) -> tuple[list, list]:
+    """
+    Default scores and impact tables for many users in one cohort-kernel
+    pass; runs in a scoring worker. Each user's table grid is priced as
+    extra starting balances on the same shared draws as their score.
+    """
+    D, P, T, R = pad_debts([(q["d"], q["p"], q["t"], q["r"]) for q in params_list])
+    per_user = {k: [q[k] for q in params_list] for k in ("mu_I", "mu_E", "var_I", "var_E")}
+    grids = [impact_amounts(q["B0"]) for q in params_list]
+    balances = [np.concatenate([[q["B0"]], q["B0"] - grid]) for q, grid in zip(params_list, grids)]
+    probs = prob_default_cohort(**per_user, B0=np.array(balances), D=D, P=P, T=T, R=R,
+                                N=SCORE_N, seed=SCORE_SEED)
+
+    scores, tables = [], []
+    for grid, row, (monthly_saving, goals) in zip(grids, probs, goal_inputs):
+        row_scores = [score_from_prob(float(q)) for q in row]
+        scores.append(row_scores[0])
+        tables.append(impact_table_from_scores(grid, row_scores[0], row_scores[1:],
+                                               monthly_saving, goals))
+    return scores, tables
+
+
+async def _bulk_scores(users: dict, wait: bool = False) -> dict:
+    """
+    Default scores for users (name -> UserOnboarding). Current stored or
+    cached scores are reused; the rest go through the cohort kernel in
+    chunks spread over the scoring workers, and are cached and stored
+    with one store write per round of chunks. The same jobs build each
+    scored user's impact table, so the refresh sweep has nothing left to
+    do for them.
+
+    When the scoring queue fills, the chunks already admitted are still
+    stored. With wait=False the 503 is then raised; with wait=True (the
+    background path) the remaining chunks are queued once room frees up.
+    """
+    scores, todo = {}, []
+    stored_scores = await asyncio.to_thread(get_stored_scores, list(users))
+    for name, user in users.items():
+        params = _score_params(user)
+        key = _score_key(params)
+        stored = stored_scores.get(name)
+        cached = score_cache.get(key)
+        if cached is not None:
+            scores[name] = cached["shield_score"]
+        elif stored and stored["input_key"] == key:
+            scores[name] = stored["shield_score"]
+        else:
+            todo.append((name, user, key, params))
+
+    chunk = max(COHORT_MIN_CHUNK, math.ceil(len(todo) / SCORE_WORKERS))
+    chunks = [todo[i:i + chunk] for i in range(0, len(todo), chunk)]
+    while chunks:
+        waits, full = [], None
+        try:
+            for part in chunks:
+                waits.append(_run_scoring(_compute_cohort, [params for *_, params in part],
+                                          [_goal_inputs(user) for _, user, _, _ in part]))
+        except HTTPException as e:
+            full = e
+        admitted, chunks = chunks[:len(waits)], chunks[len(waits):]
+
+        records, tables, now, error = {}, {}, time.time(), None
+        results = await asyncio.gather(*waits, return_exceptions=True)
+        for part, result in zip(admitted, results):
+            if isinstance(result, BaseException):
+                error = error or result
+                continue
+            (chunk_scores, chunk_tables), _ = result
+            for (name, user, key, params), score, table in zip(part, chunk_scores, chunk_tables):
+                table_key = _table_key(user, params)
+                scores[name] = score
+                score_cache.put(name, key, {"shield_score": score})
+                score_cache.put(name, table_key, table)
+                tables[name] = (table_key, table)
+                records[name] = {"shield_score": score, "input_key": key,
+                                 "model_version": MODEL_VERSION, "computed_at": now,
+                                 "table_key": table_key}
+        if records:
+            await asyncio.to_thread(save_tables, tables)
+            await asyncio.to_thread(save_scores, records)
+
+        if error is not None:
+            raise error
+        if full is not None:
+            if not wait:
+                raise full
+            if not waits:
+                await asyncio.sleep(float(full.headers["Retry-After"]))
+    return scores
+
+
+async def _refresh_stale_scores() -> None:
+    """
+    Background sweep: keep every user's stored score current.
+
+    Users and stored scores are read once per sweep, off the event loop,
+    and only stale users are awaited on. The loop yields between users so
+    a large store cannot hold up requests, and a failure for one user is
+    logged and skipped so it cannot stop the sweep.
+    """
+    while True:
+        await asyncio.sleep(SCORE_REFRESH_INTERVAL)
+        try:
+            users = await asyncio.to_thread(get_users)
+            stored_scores = await asyncio.to_thread(get_stored_scores, list(users))
+        except Exception:
+            logger.exception("Score refresh: could not load users")
+            continue
+        for name, user in users.items():
+            try:
+                await _refresh_user(user, stored_scores.get(name))
+            except Exception:
+                logger.exception("Score refresh failed for %s", name)
+            await asyncio.sleep(0)
+
+
+async def _score_within_budget(name: str, params: dict, budget_ms: float) -> dict:
+    """
+    Serve the most precise tier whose predicted latency fits budget_ms,
+    falling back to quadrature when none does or the queue is full.
+    """
+    wait_ms = _score_load["job_ms"] * _score_jobs / SCORE_WORKERS
+    for tier, n in SCORE_TIERS:
+        if _score_jobs >= SCORE_QUEUE_DEPTH:
+            break
+        if wait_ms + n * _score_load["ms_per_path"] > budget_ms:
+            continue
+
+        if n == SCORE_N:
+            # The full tier is the default score: same key, cache and store
+            key = _score_key(params)
+            result, timing, shared = await _score_once(
+                name, key, _compute_score, params, "monte_carlo", 0.0025, None)
+            result = _full_tier(result)
+        else:
+            key = _score_key(params, method="tier", N=n)
+            result = score_cache.get(key)
+            if result is not None:
+                return {"name": name, "tier": tier, **result, "cached": True}
+            result, timing, shared = await _score_once(name, key, _compute_tier, params, n)
+            result = {"tier": tier, **result}
+        if not shared:
+            _record_load(timing, n)
+        return {"name": name, **result, "cached": False,
+                "coalesced": shared, "timing": timing}
+
+    started = time.time()
+    score = await asyncio.to_thread(shield_score, **params, method="quadrature")
+    return {
+        "name":           name,
+        "tier":           "quadrature",
+        "shield_score":   score,
+        "standard_error": 0.0,      # deterministic: no sampling error
+        "cached":         False,
+        "timing":         {"queue_ms": 0.0, "compute_ms": round((time.time() - started) * 1000, 1)},
+    }
+
+
+@app.get("/score/{name}")
+async def get_score(
+    name: str,
+    method: str = "monte_carlo",
+    tol: float = 0.0025,
+    variance_reduction: Optional[str] = None,
+    budget_ms: Optional[float] = None,
+):
+    """
+    budget_ms (optional) is a latency target for the default Monte Carlo
+    score: under load fewer paths, or quadrature, are used to meet it and
+    the response names the tier served with its standard error.
+    """
+    user = await asyncio.to_thread(get_user, name)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    params = _score_params(user)
+    key = _score_key(params, method, tol, variance_reduction)
+
+    if budget_ms is not None:
+        if budget_ms <= 0:
+            raise HTTPException(status_code=400, detail="budget_ms must be positive")
+        if method != "monte_carlo" or variance_reduction is not None:
+            raise HTTPException(status_code=400,
+                                detail="budget_ms applies to the default Monte Carlo score only")
+
+    result = score_cache.get(key)
+    if result is None:
+        # Serve the score stored at onboarding if it was computed from these
+        # exact inputs under the current model version
+        stored = await asyncio.to_thread(get_stored_score, name)
+        if stored and stored["input_key"] == key:
+            result = {"shield_score": stored["shield_score"]}
+            score_cache.put(user.name, key, result)
+    if result is not None:
+        if budget_ms is not None:
+            result = _full_tier(result)
+        return {"name": user.name, **result, "cached": True}
+
+    if budget_ms is not None:
+        return await _score_within_budget(user.name, params, budget_ms)
+
+    try:
+        result, timing, shared = await _score_once(
+            user.name, key, _compute_score, params, method, tol, variance_reduction)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not shared and method == "monte_carlo" and variance_reduction is None:
+        _record_load(timing, SCORE_N)
+    return {"name": user.name, **result, "cached": False, "coalesced": shared, "timing": timing}
+
+
+@app.get("/profile/{name}")
+async def get_profile(name: str, request: Request):
+    """
+    User record, default Shield Score and purchase impact table in one
+    response, for extension sync.
+
+    The strong ETag hashes the stored record, MODEL_VERSION and
+    IMPACT_TABLE_VERSION, which fully determine the body, so a matching
+    If-None-Match is answered with 304 without touching the scorer.
+    """
+    user = await asyncio.to_thread(get_user, name)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    record = user.model_dump()
+    etag = '"' + input_key(record, model_version=MODEL_VERSION,
+                           table_version=IMPACT_TABLE_VERSION)[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    score = await get_score(name)
+    table = await _impact_table(user)
+    return JSONResponse({"user": record, "shield_score": score["shield_score"],
+                         "impact_table": table}, headers=headers)
+
+
+def _stream_plan(max_N: int) -> list[list[int]]:
+    """Shard sizes per stage: STREAM_FIRST_BATCH paths, then doubling up to max_N."""
+    stages, total = [], 0
+    while total < max_N:
+        size = min(max(STREAM_FIRST_BATCH, total), max_N - total)
+        shards = min(SCORE_WORKERS, math.ceil(size / STREAM_SHARD))
+        stages.append([size // shards + (i < size % shards) for i in range(shards)])
+        total += size
+    return stages
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.get("/score/{name}/stream")
+async def stream_score(
+    name: str,
+    tol: float = 0.0005,
+    confidence: float = 0.95,
+    max_N: int = 5_000_000,
+):
+    """
+    Server-Sent Events refining the Shield Score as more paths finish.
+
+    Emits an "estimate" event after the first STREAM_FIRST_BATCH paths and
+    after every doubling, each with its confidence interval, and closes
+    once the interval's half-width (in probability) is within tol or
+    max_N paths are used. Stages run as independent SeedSequence shards
+    on the scoring pool, so the final value can differ slightly from the
+    single-stream /score.
+
+    API-only: the dashboard shows the cached /score. This is for callers
+    that want a tighter, audited estimate and choose tol and max_N
+    themselves; the defaults run up to 25 times the paths of /score and
+    are not cached.
+    """
+    user = await asyncio.to_thread(get_user, name)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if tol <= 0 or not (0.0 < confidence < 1.0):
+        raise HTTPException(status_code=400, detail="tol must be positive and confidence in (0, 1)")
+    if not (STREAM_FIRST_BATCH <= max_N <= STREAM_MAX_N):
+        raise HTTPException(status_code=400,
+                            detail=f"max_N must be between {STREAM_FIRST_BATCH} and {STREAM_MAX_N}")
+
+    params = _score_params(user)
+    stages = _stream_plan(max_N)
+    jobs = iter(shard_jobs(**params, sizes=[n for stage in stages for n in stage],
+                            rho_IE=0.0, seed=SCORE_SEED, block_size=65_536))
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+    async def events():
+        n = defaults = 0
+        for i, stage in enumerate(stages):
+            waits = []
+            try:
+                for _ in stage:
+                    waits.append(_run_scoring(shard_defaults, next(jobs)))
+            except HTTPException as e:
+                await asyncio.gather(*waits)    # keep the queue count right
+                yield _sse("error", {"detail": e.detail})
+                return
+
+            results = await asyncio.gather(*waits)
+            n += sum(stage)
+            defaults += sum(count for count, _ in results)
+
+            prob = defaults / n
+            lower, upper = wilson_interval(defaults, n, z)
+            done = (upper - lower) / 2.0 <= tol or i == len(stages) - 1
+            yield _sse("estimate", {
+                "name":           user.name,
+                "shield_score":   score_from_prob(prob),
+                "interval":       [score_from_prob(upper), score_from_prob(lower)],
+                "standard_error": round(100 * math.sqrt(prob * (1 - prob) / n), 3),
+                "n_paths":        n,
+                "done":           done,
+            })
+            if done:
+                return
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+@app.post("/scores")
+async def get_scores(names: Optional[List[str]] = Body(default=None)):
+    """
+    Default Shield Scores for many users in one call (every stored user if
+    no names are given), computed with the cohort kernel.
+    """
+    users = await asyncio.to_thread(get_users, names)
+    scores = await _bulk_scores(users)
+    missing = [] if names is None else [name for name in names if name not in users]
+    return {"scores": scores, "missing": missing}
+
+
+def _compute_spend(params: dict, amounts: list) -> tuple[float, list]:
+    """Score before and after each spend; runs inside a scoring worker process."""
+    params = dict(params)
+    B0 = params.pop("B0")
+    surface = ScoreSurface.simulate(**params, N=SCORE_N)
+    return surface.score(B0), [surface.score(B0 - x) for x in amounts]
+
+
+@app.get("/score/{name}/spend")
+async def get_spend_scores(name: str, amount: List[float] = Query(...)):
+    """Shield Score after spending each `amount` from savings, from one simulation."""
+    user = await asyncio.to_thread(get_user, name)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    (score, spend_scores), _ = await _run_scoring(_compute_spend, _score_params(user), amount)
+
+    return {
+        "name":         user.name,
+        "shield_score": score,
+        "spend":        [{"amount": x, "shield_score": y} for x, y in zip(amount, spend_scores)],
+    }
+
+
+def _compute_scenarios(params: dict, batch: list) -> list:
+    """The /scenarios computation; runs inside a scoring worker process."""
+    return shield_score_batch(**params, scenarios=batch, N=SCORE_N)
+
+
+@app.post("/score/{name}/scenarios")
+async def score_scenarios(name: str, scenarios: List[ScoreScenario]):
+    """Score several what-if scenarios against the same simulated paths."""
+    user = await asyncio.to_thread(get_user, name)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if len(scenarios) > MAX_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SCENARIOS} scenarios per request")
+
+    params = _score_params(user)
+    bnpl_payments = params["p"][len(user.debts):] if user.bnpl_plans else []
+
+    batch = []
+    for sc in scenarios:
+        payments = sc.monthly_payments
+        if payments is not None and len(payments) != len(user.debts):
+            raise HTTPException(status_code=400, detail="monthly_payments needs one entry per debt")
+        extra = _debt_lists(sc.extra_debts) if sc.extra_debts else None
+        batch.append(Scenario(
+            purchase   = sc.purchase_amount,
+            extra_debt = tuple(zip(*extra)) if extra else (),
+            payments   = tuple(payments) + tuple(bnpl_payments) if payments and user.debts else None,
+        ))
+
+    scores, _ = await _run_scoring(_compute_scenarios, params, batch)
+    return {"name": user.name, "scores": scores}
+
+
+def _compute_curve(params: dict, horizon: int):
+    """The /curve computation; runs inside a scoring worker process."""
+    return default_curve(**params, horizon=horizon, N=SCORE_N, block_size=SCORE_BLOCK)
+
+
+@app.get("/score/{name}/curve")
+async def get_score_curve(name: str, horizon: int = 12):
+    """Default probability and Shield Score by month, from one simulation."""
+    user = await asyncio.to_thread(get_user, name)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not (1 <= horizon <= 60):
+        raise HTTPException(status_code=400, detail="horizon must be between 1 and 60 months")
+
+    curve, _ = await _run_scoring(_compute_curve, _score_params(user), horizon)
+    return {
+        "name":                     user.name,
+        "horizon":                  horizon,
+        "default_prob_by_month":    curve.cumulative.tolist(),
+        "shield_score_by_month":    [score_from_prob(q) for q in curve.cumulative],
+        "median_months_to_default": curve.median_months,
+    }
+
+
+def _compute_attribution(params: dict, extra_payment: float) -> dict:
+    """The /attribution computation; runs inside a scoring worker process."""
+    return debt_attribution(**params, N=SCORE_N, extra_payment=extra_payment)
+
+
+@app.get("/score/{name}/attribution")
+async def get_score_attribution(name: str, extra_payment: float = 50.0):
+    """Per-debt score impact: each debt removed, and each paid down faster."""
+    user = await asyncio.to_thread(get_user, name)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    result, _ = await _run_scoring(_compute_attribution, _score_params(user), extra_payment)
+    labels = _debt_labels(user)
+    categories = [debt.category for debt in user.debts] + ["bnpl"] * (len(labels) - len(user.debts))
+    debts = [
+        {"label": label, "category": category, **row}
+        for label, category, row in zip(labels, categories, result["debts"])
+    ]
+    return {"name": user.name, "shield_score": result["shield_score"],
+            "extra_payment": extra_payment, "debts": debts}
+
+
+def _compute_repayment(params: dict, extra_budget: float, objective: str,
+                       custom_splits: Optional[list]) -> dict:
+    """The repayment optimiser; runs inside a scoring worker process."""
+    return optimise_repayment(**params, extra_budget=extra_budget, objective=objective,
+                              custom_splits=custom_splits, N=SCORE_N)
+
+
+@app.post("/score/{name}/repayment")
+async def optimise_debt_repayment(name: str, request: RepaymentRequest):
+    """Rank avalanche, snowball and split allocations of an extra monthly budget."""
+    user = await asyncio.to_thread(get_user, name)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not (user.debts or user.bnpl_plans):
+        raise HTTPException(status_code=400, detail="User has no debts to repay")
+
+    try:
+        result, _ = await _run_scoring(_compute_repayment, _score_params(user), request.extra_budget,
+                                       request.objective, request.custom_splits)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    labels = _debt_labels(user)
+    for s in [result["baseline"]] + result["strategies"]:
+        if "order" in s:
+            s["order"] = [labels[i] for i in s["order"]]
+        if "weights" in s:
+            s["weights"] = dict(zip(labels, s["weights"]))
+    return {"name": user.name, **result}
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 class SavingsGoal(BaseModel):
@@ -15,6 +15,12 @@ class Debt(BaseModel):
     apr: float
     months_remaining: Optional[float] = None
 
+class BNPLPlan(BaseModel):
+    provider: str                 # e.g. Klarna, Clearpay
+    instalment_amount: float = Field(gt=0)       # fixed amount per instalment, 0% APR
+    instalments_remaining: int = Field(ge=1)
+    count: int = Field(default=1, ge=1)          # identical plans are stored once with a count
+
 class UserOnboarding(BaseModel):
     name: str
     current_savings: float
@@ -25,4 +31,15 @@ class UserOnboarding(BaseModel):
     credit_limit: float
     savings_allocation_pct: float = 50.0   # % of monthly surplus allocated to savings goals
     savings_goals: List[SavingsGoal]
-    debts: List[Debt] = []
\ No newline at end of file
+    debts: List[Debt] = []
+    bnpl_plans: List[BNPLPlan] = []
+
+class ScoreScenario(BaseModel):
+    purchase_amount: float = 0.0                     # paid from savings up front
+    extra_debts: List[Debt] = []                     # e.g. financing the purchase
+    monthly_payments: Optional[List[float]] = None   # replaces current payments, one per debt
+
+class RepaymentRequest(BaseModel):
+    extra_budget: float                               # extra £ per month towards debts
+    objective: str = "score"                          # "score" or "interest"
+    custom_splits: List[List[float]] = Field(default=[], max_length=498)  # extra weight vectors, one weight per debt
@@ -0,0 +1,56 @@
+"""
+In-process cache of Shield Scores.
+
+Entries are keyed by a hash of the exact scoring inputs (the _score_params
+dict plus N, seed and estimator options), so a profile that has not changed
+is never simulated twice. Entries are also indexed by user name, letting
+data_store drop a user's scores the moment that user is written.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+
+
+def input_key(params: dict, **options) -> str:
+    """Canonical hash of the scoring inputs; equal inputs give equal keys."""
+    payload = json.dumps({"params": params, "options": options}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """LRU map from input_key(...) to a score result."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize  = maxsize
+        self._entries: OrderedDict = OrderedDict()   # key -> (name, result)
+        self._by_user: dict = {}                     # name -> {keys}
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, name: str, key: str, result) -> None:
+        self._entries[key] = (name, result)
+        self._entries.move_to_end(key)
+        self._by_user.setdefault(name, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            old_key, (old_name, _) = self._entries.popitem(last=False)
+            self._discard(old_name, old_key)
+
+    def invalidate(self, name: str) -> None:
+        """Drop every cached score for this user."""
+        for key in self._by_user.pop(name, ()):
+            self._entries.pop(key, None)
+
+    def _discard(self, name: str, key: str) -> None:
+        keys = self._by_user.get(name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[name]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,6 +1,197 @@
 import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional
+
 import numpy as np
 
+import draw_pool
+
+# Bump whenever an engine change can move the score for unchanged inputs;
+# scores stored under an older version are recomputed.
+MODEL_VERSION = "1"
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+
+
+# Standard-normal CDF tabulated on [-10, 10]; linear interpolation on this
+# grid is accurate to ~3e-8, and np.interp is a single vectorised call.
+_CDF_X = np.linspace(-10.0, 10.0, 20_001)
+_CDF_Y = 0.5 * (1.0 + np.frompyfunc(math.erf, 1, 1)(_CDF_X / math.sqrt(2.0)).astype(float))
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    return np.interp(x, _CDF_X, _CDF_Y)
+
+
+def _norm_logcdf(x: np.ndarray) -> np.ndarray:
+    """log Phi(x) without underflow: erfc above -5, the asymptotic series below."""
+    x = np.asarray(x, dtype=float)
+    safe = np.maximum(x, -5.0)
+    near = np.log(0.5 * np.array([math.erfc(-v / math.sqrt(2.0)) for v in safe.ravel()]).reshape(x.shape))
+    tail = np.minimum(x, -5.0)
+    far = (-0.5 * tail * tail - np.log(-tail) - 0.5 * math.log(2.0 * math.pi)
+           + np.log1p(-1.0 / tail**2 + 3.0 / tail**4))
+    return np.where(x >= -5.0, near, far)
+
+
+@dataclass(frozen=True)
+class DefaultEstimate:
+    """A Monte Carlo default probability with its confidence interval."""
+    prob: float
+    lower: float
+    upper: float
+    n_paths: int
+    std_error: float
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    A what-if variant of one user's inputs, for shield_score_batch.
+
+    purchase   : Amount paid from savings up front (reduces B0).
+    extra_debt : Additional debts as (d, p, t, r) tuples, e.g. a financed
+                 purchase or a new credit line.
+    payments   : Replacement monthly payments for the user's existing debts,
+                 one per debt; None keeps the current payments.
+    """
+    purchase: float = 0.0
+    extra_debt: tuple = ()
+    payments: Optional[tuple] = None
+
+
+@dataclass(frozen=True)
+class DefaultCurve:
+    """
+    Cumulative default probability by month over a horizon.
+
+    cumulative[m - 1] is the fraction of paths that have defaulted by the
+    end of month m; median_months is the first month by which half of the
+    paths have defaulted, or None if that is beyond the horizon.
+    """
+    cumulative: np.ndarray
+    median_months: Optional[int]
+    n_paths: int
+
+    @property
+    def horizon(self) -> int:
+        return len(self.cumulative)
+
+    def prob_default(self, months: int) -> float:
+        """Probability of defaulting within the first `months` months."""
+        if not (1 <= months <= self.horizon):
+            raise ValueError(f"months must be in [1, {self.horizon}].")
+        return float(self.cumulative[months - 1])
+
+    def survival(self) -> np.ndarray:
+        """Probability of not having defaulted by the end of each month."""
+        return 1.0 - self.cumulative
+
+
+def wilson_interval(defaults: int, n: int, z: float) -> tuple[float, float]:
+    """Wilson score interval for a binomial proportion defaults / n."""
+    phat = defaults / n
+    denom = 1.0 + z * z / n
+    centre = (phat + z * z / (2 * n)) / denom
+    half = z * math.sqrt(phat * (1.0 - phat) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def check_inputs(d, p, t, r, var_I: float, var_E: float, rho_IE: float) -> None:
+    """Raise ValueError unless the debt lists, variances and correlation are valid."""
+    k = len(d)
+    if not (len(p) == len(t) == len(r) == k):
+        raise ValueError("d, p, t, and r must all have the same length.")
+    if var_I < 0 or var_E < 0:
+        raise ValueError("Variances must be non-negative.")
+    if not (-1.0 <= rho_IE <= 1.0):
+        raise ValueError("rho_IE must be in [-1, 1].")
+
+
+def debt_schedule(
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    horizon: int = 12,
+) -> np.ndarray:
+    """
+    Deterministic month-by-month required payment for every debt.
+
+    Debt balances evolve independently of the simulated cash path, so the
+    schedule is computed once per call and shared by all Monte Carlo trials.
+
+    Parameters
+    ----------
+    d, p, t, r : Debt balances, fixed payments, terms and monthly rates, as
+                 described in prob_default_12m. May also be (U, k) arrays
+                 holding one padded row of debts per user (see pad_debts).
+    horizon    : Number of months to schedule (default 12).
+
+    Returns
+    -------
+    np.ndarray : Shape (k, horizon), or (U, k, horizon) for padded input;
+                 entry [..., i, m - 1] is the payment (or balloon) required
+                 on debt i in month m.
+    """
+    k = len(d)
+    if not (len(p) == len(t) == len(r) == k):
+        raise ValueError("d, p, t, and r must all have the same length.")
+
+    bal = np.array(d, dtype=float)
+    p = np.array(p, dtype=float)
+    t = np.array(t, dtype=float)
+    r = np.array(r, dtype=float)
+    if not (bal.shape == p.shape == t.shape == r.shape):
+        raise ValueError("d, p, t, and r must all have the same length.")
+
+    required = np.zeros(bal.shape + (horizon,))
+
+    for m in range(1, horizon + 1):
+        bal += bal * r * (bal > 0)
+
+        within_term = (m <= t)
+        has_balance = bal > 1e-9
+
+        scheduled = np.minimum(p, bal)
+        scheduled = np.where(within_term & has_balance, scheduled, 0.0)
+
+        is_last_month = (m == t)
+        residual = np.where(is_last_month & has_balance, bal - scheduled, 0.0)
+
+        required[..., m - 1] = scheduled + residual
+
+        bal -= scheduled + residual
+        bal = np.maximum(bal, 0.0)
+
+    return required
+
+
+def _net_cash_flow(
+    Z: np.ndarray,
+    mu_I: float,
+    mu_E: float,
+    sigma_I: float,
+    sigma_E: float,
+    rho_IE: float,
+) -> np.ndarray:
+    """Monthly income minus expenses for standard-normal draws Z[..., 2]."""
+    income   = mu_I + sigma_I * Z[..., 0]
+    expenses = mu_E + sigma_E * (rho_IE * Z[..., 0]
+                                 + math.sqrt(max(0.0, 1.0 - rho_IE**2)) * Z[..., 1])
+    return income - expenses
+
+
+def _cash_paths(Z, mu_I, mu_E, sigma_I, sigma_E, rho_IE, required, B0) -> np.ndarray:
+    """Cash balance after each month, shape Z.shape[:-1]."""
+    net_cash_flow = _net_cash_flow(Z, float(mu_I), float(mu_E), sigma_I, sigma_E, rho_IE)
+    return float(B0) + np.cumsum(net_cash_flow - required, axis=-1)
+
 
 def prob_default_12m(
     mu_I: float,
@@ -15,6 +206,9 @@ def prob_default_12m(
     N: int = 200_000,
     rho_IE: float = 0.0,
     seed: int = 42,
+    block_size: Optional[int] = None,
+    dtype=np.float64,
+    variance_reduction: Optional[str] = None,
 ) -> float:
     """
     Estimate the probability of defaulting at least once in the next 12 months
@@ -22,85 +216,638 @@ def prob_default_12m(
 
     Parameters
     ----------
-    mu_I    : Mean monthly income.
-    mu_E    : Mean monthly expenses (excluding debt payments).
-    var_I   : Variance of monthly income.
-    var_E   : Variance of monthly expenses.
-    d       : List of current debt balances.
-    p       : List of fixed monthly payments, one per debt.
-    t       : List of payment durations (in months). Use math.inf for
-              indefinite / interest-only loans.
-    r       : List of monthly interest rates, one per debt.
-    B0      : Starting cash balance (default 0).
-    N       : Number of Monte Carlo trials (default 200,000).
-    rho_IE  : Pearson correlation between income and expense shocks.
-    seed    : Random seed for reproducibility.
+    mu_I       : Mean monthly income.
+    mu_E       : Mean monthly expenses (excluding debt payments).
+    var_I      : Variance of monthly income.
+    var_E      : Variance of monthly expenses.
+    d          : List of current debt balances.
+    p          : List of fixed monthly payments, one per debt.
+    t          : List of payment durations (in months). Use math.inf for
+                 indefinite / interest-only loans.
+    r          : List of monthly interest rates, one per debt.
+    B0         : Starting cash balance (default 0).
+    N          : Number of Monte Carlo trials (default 200,000).
+    rho_IE     : Pearson correlation between income and expense shocks.
+    seed       : Random seed for reproducibility.
+    block_size : If set, trials are simulated in blocks of this many paths
+                 and only the default count is kept between blocks, so peak
+                 memory is bounded by the block rather than by N (e.g.
+                 65_536 paths is about 40 MB). None runs all N at once.
+    dtype      : np.float64 (default) or np.float32 for the draws and cash
+                 walk; float32 halves memory at ~1e-7 relative precision.
+    variance_reduction : None, "antithetic", "control_variate", "sobol" or
+                 "importance"; see estimate_default_12m, which also reports the achieved
+                 standard error. Not combinable with block_size.
 
     Returns
     -------
     float : Estimated probability of default within 12 months.
+
+    Notes
+    -----
+    Blocks consume one RNG stream in order, so results are bit-reproducible
+    for a given seed, block size and dtype. In float64 the stream is the
+    same as a single (N, 12, 2) draw, so the block size does not change the
+    result at all.
     """
 
-    k = len(d)
-    if not (len(p) == len(t) == len(r) == k):
-        raise ValueError("d, p, t, and r must all have the same length.")
-    if var_I < 0 or var_E < 0:
-        raise ValueError("Variances must be non-negative.")
-    if not (-1.0 <= rho_IE <= 1.0):
-        raise ValueError("rho_IE must be in [-1, 1].")
+    check_inputs(d, p, t, r, var_I, var_E, rho_IE)
     if N <= 0:
         raise ValueError("N must be a positive integer.")
+    if block_size is not None and block_size <= 0:
+        raise ValueError("block_size must be a positive integer.")
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("dtype must be float32 or float64.")
 
-    d = np.array(d, dtype=float)
-    p = np.array(p, dtype=float)
-    t = np.array(t, dtype=float)
-    r = np.array(r, dtype=float)
+    if variance_reduction is not None:
+        if block_size is not None or dtype != np.float64:
+            raise ValueError("variance_reduction does not support block_size or float32.")
+        return estimate_default_12m(
+            mu_I, mu_E, var_I, var_E, d, p, t, r, B0=B0, N=N, rho_IE=rho_IE,
+            seed=seed, variance_reduction=variance_reduction,
+        ).prob
+
+    blocks = _default_counts(mu_I, mu_E, var_I, var_E, d, p, t, r,
+                             B0, N, rho_IE, seed, block_size or N, dtype)
+    defaults = sum(count for _, count in blocks)
+
+    return defaults / N
+
+
+def _default_counts(mu_I, mu_E, var_I, var_E, d, p, t, r, B0, N, rho_IE, seed, block_size, dtype):
+    """Yield (paths, defaults) for successive blocks of the seeded trial stream."""
+    required = debt_schedule(d, p, t, r).sum(axis=0)
+
+    for C in _cash_blocks(mu_I, mu_E, var_I, var_E, required, N, rho_IE, seed, block_size, dtype):
+        yield len(C), int((float(B0) + C < 0).any(axis=1).sum())
+
+
+def _cash_blocks(mu_I, mu_E, var_I, var_E, required, N, rho_IE, seed, block_size, dtype):
+    """
+    Yield cumulative (net cash flow - required) paths, shape (n, horizon)
+    with horizon = len(required), for successive blocks of the seeded trial
+    stream; B0 + C is the balance. Consumers may stop early; no work is done
+    for blocks never requested.
+    """
+    required = np.asarray(required, dtype=dtype)
+    horizon = len(required)
 
     sigma_I = math.sqrt(var_I)
     sigma_E = math.sqrt(var_E)
 
+    for Z in _draw_blocks(N, horizon, seed, block_size, dtype):
+        yield _cash_paths(Z, mu_I, mu_E, sigma_I, sigma_E, rho_IE, required, 0.0)
+
+
+def _draw_blocks(N, horizon, seed, block_size, dtype):
+    """
+    Yield the seeded (N, horizon, 2) standard-normal draws in blocks of
+    block_size rows, sliced from the attached draw pool when there is one.
+    """
+    # Shards pass SeedSequence children, which never match a pooled int seed.
+    use_pool = dtype == np.float64 and isinstance(seed, int)
+    pool = draw_pool.get(N, horizon, seed) if use_pool else None
     rng = np.random.default_rng(seed)
 
-    Z = rng.standard_normal((N, 12, 2))
+    for start in range(0, N, block_size):
+        n = min(block_size, N - start)
 
-    income   = mu_I + sigma_I * Z[..., 0]
-    expenses = mu_E + sigma_E * (rho_IE * Z[..., 0]
-                                 + math.sqrt(max(0.0, 1.0 - rho_IE**2)) * Z[..., 1])
+        if pool is not None:
+            yield pool[start:start + n]
+        else:
+            yield rng.standard_normal((n, horizon, 2), dtype=dtype)
+
+
+def default_curve(
+    mu_I: float,
+    mu_E: float,
+    var_I: float,
+    var_E: float,
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    B0: float = 0.0,
+    horizon: int = 12,
+    N: int = 200_000,
+    rho_IE: float = 0.0,
+    seed: int = 42,
+    block_size: Optional[int] = None,
+) -> DefaultCurve:
+    """
+    Full default-time distribution over an arbitrary horizon in one
+    simulation.
 
-    net_cash_flow = income - expenses
+    Each path's first month with a negative balance is recorded, so 3-, 6-
+    and 12-month probabilities (or any horizon, e.g. 24 or 36) come from the
+    same draws. With horizon=12, curve.prob_default(12) equals
+    prob_default_12m for the same seed and N.
 
-    B   = np.full(N, B0, dtype=float)
-    bal = np.tile(d, (N, 1))
+    Returns
+    -------
+    DefaultCurve : Cumulative default probability by month and the median
+                   time to default.
+    """
+    check_inputs(d, p, t, r, var_I, var_E, rho_IE)
+    if N <= 0 or horizon <= 0:
+        raise ValueError("N and horizon must be positive integers.")
 
-    defaulted = np.zeros(N, dtype=bool)
+    required = debt_schedule(d, p, t, r, horizon=horizon).sum(axis=0)
 
-    for m in range(1, 13):
-        active = ~defaulted
+    first_default = np.zeros(horizon, dtype=np.int64)
+    for C in _cash_blocks(mu_I, mu_E, var_I, var_E, required, N, rho_IE, seed,
+                          block_size or N, np.dtype(np.float64)):
+        below = float(B0) + C < 0
+        month = below.argmax(axis=1)
+        first_default += np.bincount(month[below.any(axis=1)], minlength=horizon)
 
-        positive = bal > 0
-        bal[active] += (bal * r)[active] * positive[active]
+    cumulative = np.cumsum(first_default) / N
+    reached = np.flatnonzero(cumulative >= 0.5)
+    return DefaultCurve(
+        cumulative=cumulative,
+        median_months=int(reached[0]) + 1 if len(reached) else None,
+        n_paths=N,
+    )
 
-        within_term = (m <= t)
-        has_balance = bal > 1e-9
 
-        scheduled = np.minimum(p, bal)
-        scheduled = np.where(within_term & has_balance, scheduled, 0.0)
+class ScoreSurface:
+    """
+    Default probability as a function of starting cash balance, from a
+    single simulation.
 
-        is_last_month = (m == t)
-        residual = np.where(is_last_month & has_balance, bal - scheduled, 0.0)
+    B0 only moves the default threshold: a path defaults iff
+    B0 + min_m C_m < 0, where C_m is its cumulative net cash flow minus
+    obligations. Keeping the sorted per-path minima turns P(default | B0)
+    into an empirical-CDF lookup, so "what if I spend X from savings" is a
+    binary search rather than a fresh simulation. For the same seed and N
+    the lookup equals prob_default_12m exactly.
+    """
 
-        total_required = scheduled.sum(axis=1) + residual.sum(axis=1)
+    def __init__(self, running_minima: np.ndarray):
+        self._minima = np.sort(np.asarray(running_minima, dtype=float))
 
-        B[active] += net_cash_flow[active, m - 1]
-        B[active] -= total_required[active]
+    @classmethod
+    def simulate(
+        cls,
+        mu_I: float,
+        mu_E: float,
+        var_I: float,
+        var_E: float,
+        d: list[float],
+        p: list[float],
+        t: list[float],
+        r: list[float],
+        N: int = 200_000,
+        rho_IE: float = 0.0,
+        seed: int = 42,
+        block_size: Optional[int] = None,
+    ) -> "ScoreSurface":
+        """Run the Monte Carlo once (arguments as prob_default_12m, minus B0)."""
+        check_inputs(d, p, t, r, var_I, var_E, rho_IE)
+        if N <= 0:
+            raise ValueError("N must be a positive integer.")
 
-        defaulted |= (B < 0)
+        required = debt_schedule(d, p, t, r).sum(axis=0)
+        blocks = _cash_blocks(mu_I, mu_E, var_I, var_E, required, N, rho_IE, seed,
+                              block_size or N, np.dtype(np.float64))
+        return cls(np.concatenate([C.min(axis=1) for C in blocks]))
 
-        payments_made = scheduled + residual
-        bal -= payments_made
-        bal = np.maximum(bal, 0.0)
+    @property
+    def n_paths(self) -> int:
+        return len(self._minima)
+
+    def prob_default(self, B0):
+        """P(default | starting balance B0); B0 may be a scalar or an array."""
+        defaults = np.searchsorted(self._minima, -np.asarray(B0, dtype=float), side="left")
+        return defaults / self.n_paths
+
+    def score(self, B0):
+        """Shield Score for starting balance B0 (scalar or array)."""
+        prob = self.prob_default(B0)
+        if np.ndim(prob) == 0:
+            return score_from_prob(float(prob))
+        return [score_from_prob(float(q)) for q in prob]
+
+
+def shard_defaults(args: tuple) -> int:
+    """Process-pool entry point: default count for one shard's stream."""
+    return sum(count for _, count in _default_counts(*args))
+
+
+def shard_jobs(mu_I, mu_E, var_I, var_E, d, p, t, r, B0, sizes, rho_IE, seed, block_size) -> list:
+    """shard_defaults arguments for shards of the given sizes, one SeedSequence child each."""
+    children = np.random.SeedSequence(seed).spawn(len(sizes))
+    return [(mu_I, mu_E, var_I, var_E, d, p, t, r, B0, n, rho_IE, child,
+             block_size, np.dtype(np.float64))
+            for n, child in zip(sizes, children)]
+
+
+def prob_default_12m_parallel(
+    mu_I: float,
+    mu_E: float,
+    var_I: float,
+    var_E: float,
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    B0: float = 0.0,
+    N: int = 200_000,
+    rho_IE: float = 0.0,
+    seed: int = 42,
+    shards: Optional[int] = None,
+    block_size: int = 65_536,
+    executor: Optional[Executor] = None,
+) -> float:
+    """
+    prob_default_12m sharded across a process pool, for very large N such as
+    nightly cohort rescoring.
+
+    The N trials are split into `shards` near-equal parts, each simulated on
+    its own np.random.SeedSequence(seed).spawn(shards) child stream in
+    constant-memory blocks, and the default counts are summed. The result
+    depends only on seed, N and shards -- not on how many workers run them
+    or in what order -- but differs from the single-stream prob_default_12m.
+
+    Parameters
+    ----------
+    mu_I .. seed : As in prob_default_12m.
+    shards       : Number of independent streams (default: CPU count).
+    block_size   : Paths per block within a shard.
+    executor     : Pool to run on; by default a ProcessPoolExecutor with one
+                   worker per shard (capped at the CPU count) is created for
+                   the call.
+    """
+    check_inputs(d, p, t, r, var_I, var_E, rho_IE)
+    shards = shards or os.cpu_count() or 1
+    if N <= 0 or shards <= 0 or block_size <= 0:
+        raise ValueError("N, shards and block_size must be positive integers.")
+    shards = min(shards, N)
+
+    sizes = [N // shards + (i < N % shards) for i in range(shards)]
+    jobs = shard_jobs(mu_I, mu_E, var_I, var_E, d, p, t, r, B0, sizes, rho_IE, seed, block_size)
+
+    if executor is not None:
+        counts = list(executor.map(shard_defaults, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=min(shards, os.cpu_count() or 1)) as pool:
+            counts = list(pool.map(shard_defaults, jobs))
+
+    return sum(counts) / N
+
+
+def estimate_default_12m(
+    mu_I: float,
+    mu_E: float,
+    var_I: float,
+    var_E: float,
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    B0: float = 0.0,
+    N: int = 200_000,
+    rho_IE: float = 0.0,
+    seed: int = 42,
+    variance_reduction: Optional[str] = None,
+    confidence: float = 0.95,
+    replicates: int = 16,
+) -> DefaultEstimate:
+    """
+    Monte Carlo default probability with its achieved standard error,
+    optionally using a variance-reduction scheme.
+
+    Parameters
+    ----------
+    mu_I .. seed       : As in prob_default_12m.
+    variance_reduction :
+        None              Plain Monte Carlo (binomial standard error).
+        "antithetic"      N/2 draws Z paired with -Z; the error comes from
+                          the spread of the pair averages.
+        "control_variate" Uses "balance below zero at month 12", whose
+                          probability is the analytic Normal PD
+                          Phi(-(B0 + sum(drift)) / (s * sqrt(12))), with the
+                          regression-optimal coefficient.
+        "sobol"           Scrambled Sobol points mapped to normals, split
+                          into `replicates` independent scrambles whose
+                          spread gives the error. N is rounded up so each
+                          replicate is a power of two. Requires scipy.
+        "importance"      Exponentially tilted sampling for rare defaults:
+                          shock means are shifted towards lower net cash
+                          flow (a mixture over the month of default) and
+                          each defaulting path is reweighted by its
+                          likelihood ratio. Resolves probabilities around
+                          1e-4 with ~10k paths, where plain sampling sees
+                          about one default.
+    confidence         : Two-sided level of the reported interval.
+    replicates         : Number of independent scrambles for "sobol".
+
+    Returns
+    -------
+    DefaultEstimate : Probability, interval, paths used and standard error.
+                      Compare std_error across schemes to choose N per
+                      deployment.
+    """
+    check_inputs(d, p, t, r, var_I, var_E, rho_IE)
+    if N <= 0:
+        raise ValueError("N must be a positive integer.")
+    if not (0.0 < confidence < 1.0):
+        raise ValueError("confidence must be in (0, 1).")
 
-    return float(defaulted.sum()) / N
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+    if variance_reduction is None:
+        defaults = sum(count for _, count in _default_counts(
+            mu_I, mu_E, var_I, var_E, d, p, t, r, B0, N, rho_IE, seed, N, np.dtype(np.float64)))
+        prob = defaults / N
+        lower, upper = wilson_interval(defaults, N, z)
+        return DefaultEstimate(prob=prob, lower=lower, upper=upper, n_paths=N,
+                               std_error=math.sqrt(prob * (1.0 - prob) / N))
+
+    required = debt_schedule(d, p, t, r).sum(axis=0)
+    sigma_I = math.sqrt(var_I)
+    sigma_E = math.sqrt(var_E)
+    rng = np.random.default_rng(seed)
+
+    def defaulted(Z):
+        B = _cash_paths(Z, mu_I, mu_E, sigma_I, sigma_E, rho_IE, required, B0)
+        return (B < 0).any(axis=-1), B[..., -1] < 0
+
+    if variance_reduction == "antithetic":
+        half = max(1, N // 2)
+        Z = rng.standard_normal((half, 12, 2))
+        Y = 0.5 * (defaulted(Z)[0].astype(float) + defaulted(-Z)[0])
+        n_paths = 2 * half
+        prob = float(Y.mean())
+        std_error = float(Y.std(ddof=1)) / math.sqrt(half) if half > 1 else 0.0
+
+    elif variance_reduction == "control_variate":
+        D, X = defaulted(rng.standard_normal((N, 12, 2)))
+        D = D.astype(float)
+        X = X.astype(float)
+
+        var_net = var_I + var_E - 2.0 * rho_IE * sigma_I * sigma_E
+        s12 = math.sqrt(max(0.0, var_net) * 12)
+        mean_12 = B0 + (mu_I - mu_E) * 12 - required.sum()
+        if s12 > 0:
+            EX = NormalDist().cdf(-mean_12 / s12)
+        else:
+            EX = 1.0 if mean_12 < 0 else 0.0
+
+        var_X = float(X.var())
+        beta = float(np.mean((D - D.mean()) * (X - X.mean()))) / var_X if var_X > 0 else 0.0
+        Y = D - beta * (X - EX)
+        n_paths = N
+        prob = float(Y.mean())
+        std_error = float(Y.std(ddof=1)) / math.sqrt(N) if N > 1 else 0.0
+
+    elif variance_reduction == "sobol":
+        try:
+            from scipy.special import ndtri
+            from scipy.stats import qmc
+        except ImportError as e:
+            raise ImportError("variance_reduction='sobol' requires scipy.") from e
+        if replicates < 2:
+            raise ValueError("sobol needs at least 2 replicates.")
+
+        m = max(1, math.ceil(math.log2(math.ceil(N / replicates))))
+        means = []
+        for child in np.random.SeedSequence(seed).spawn(replicates):
+            U = qmc.Sobol(d=24, scramble=True, seed=np.random.default_rng(child)).random_base2(m)
+            Z = ndtri(U).reshape(-1, 12, 2)
+            means.append(defaulted(Z)[0].mean())
+        means = np.array(means)
+        n_paths = replicates * 2**m
+        prob = float(means.mean())
+        std_error = float(means.std(ddof=1)) / math.sqrt(replicates)
+
+    elif variance_reduction == "importance":
+        var_net = var_I + var_E - 2.0 * rho_IE * sigma_I * sigma_E
+        s = math.sqrt(max(0.0, var_net))
+        months = np.arange(1, 13)
+
+        # One tilted component per month m: shocks in months 1..m are
+        # shifted along -a (Z . a is the net cash-flow shock) just enough to
+        # put the expected balance at zero in month m. Components are mixed
+        # in proportion to the analytic chance of hitting zero in that month,
+        # plus 10% untilted paths, which caps every weight at 10.
+        a = np.array([sigma_I - sigma_E * rho_IE,
+                      -sigma_E * math.sqrt(max(0.0, 1.0 - rho_IE**2))])
+        gap = B0 + np.cumsum((mu_I - mu_E) - required)
+        thetas = np.zeros((12, 12, 2))
+        if s > 0:
+            shift = np.maximum(gap / (months * s), 0.0)
+            for m in months:
+                thetas[m - 1, :m] = -shift[m - 1] * a / s
+            # Relative weights in log space: for a well-off user every
+            # Phi(-gap / ...) is far below the tabulated CDF's range
+            log_hit = _norm_logcdf(-gap / (s * np.sqrt(months)))
+            hit = np.exp(log_hit - log_hit.max())
+        else:
+            hit = np.ones(12)
+
+        n_plain = N // 10
+        counts = np.floor((N - n_plain) * hit / hit.sum()).astype(int)
+        counts[np.argmax(hit)] += N - n_plain - counts.sum()
+
+        Z = rng.standard_normal((N, 12, 2))
+        Z[n_plain:] += np.repeat(thetas, counts, axis=0)
+        D = defaulted(Z)[0]
+
+        log_lr = (np.einsum("nij,mij->nm", Z[D], thetas)
+                  - 0.5 * (thetas * thetas).sum(axis=(1, 2)))
+        # Mixture density over the target density, summed in log space:
+        # with tilts of tens of standard deviations exp(log_lr) overflows
+        used = counts > 0
+        log_mix = log_lr[:, used] + np.log(counts[used] / N)
+        if n_plain:
+            log_mix = np.column_stack([log_mix, np.full(len(log_mix), math.log(n_plain / N))])
+        top = log_mix.max(axis=1, keepdims=True)
+        log_denom = top[:, 0] + np.log(np.exp(log_mix - top).sum(axis=1))
+        Y = np.zeros(N)
+        Y[D] = np.exp(-log_denom)
+        n_paths = N
+        prob = float(Y.mean())
+        std_error = float(Y.std(ddof=1)) / math.sqrt(N) if N > 1 else 0.0
+
+    else:
+        raise ValueError(f"Unknown variance_reduction: {variance_reduction!r}.")
+
+    prob = min(1.0, max(0.0, prob))
+    return DefaultEstimate(
+        prob=prob,
+        lower=max(0.0, prob - z * std_error),
+        upper=min(1.0, prob + z * std_error),
+        n_paths=n_paths,
+        std_error=std_error,
+    )
+
+
+def prob_default_12m_adaptive(
+    mu_I: float,
+    mu_E: float,
+    var_I: float,
+    var_E: float,
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    B0: float = 0.0,
+    rho_IE: float = 0.0,
+    seed: int = 42,
+    tol: float = 0.0025,
+    confidence: float = 0.95,
+    batch_size: int = 10_000,
+    max_N: int = 200_000,
+) -> DefaultEstimate:
+    """
+    Sequential Monte Carlo: simulate batches of paths until the Wilson
+    interval on the default probability is narrower than +/-tol, or max_N
+    paths have been used.
+
+    Parameters
+    ----------
+    mu_I .. seed : As in prob_default_12m.
+    tol          : Target half-width of the interval, in probability
+                   (0.0025 = +/-0.25 Shield Score points).
+    confidence   : Two-sided confidence level of the interval.
+    batch_size   : Paths simulated between stopping checks.
+    max_N        : Hard cap on paths; the interval may be wider than tol
+                   when it is reached.
+
+    Returns
+    -------
+    DefaultEstimate : Probability, interval, paths used and standard error.
+
+    Notes
+    -----
+    Users near 0% or 100% default stop after one or two batches; only users
+    near 50% need the full max_N. Batches follow the same seeded stream as
+    prob_default_12m, so at max_N the estimate equals prob_default_12m(N=max_N).
+    """
+    check_inputs(d, p, t, r, var_I, var_E, rho_IE)
+    if tol <= 0:
+        raise ValueError("tol must be positive.")
+    if not (0.0 < confidence < 1.0):
+        raise ValueError("confidence must be in (0, 1).")
+    if batch_size <= 0 or max_N <= 0:
+        raise ValueError("batch_size and max_N must be positive integers.")
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+    n = defaults = 0
+    for paths, count in _default_counts(mu_I, mu_E, var_I, var_E, d, p, t, r,
+                                        B0, max_N, rho_IE, seed, batch_size, np.dtype(np.float64)):
+        n += paths
+        defaults += count
+        lower, upper = wilson_interval(defaults, n, z)
+        if (upper - lower) / 2.0 <= tol:
+            break
+
+    prob = defaults / n
+    return DefaultEstimate(
+        prob=prob, lower=lower, upper=upper, n_paths=n,
+        std_error=math.sqrt(prob * (1.0 - prob) / n),
+    )
+
+
+def prob_default_12m_quadrature(
+    mu_I: float,
+    mu_E: float,
+    var_I: float,
+    var_E: float,
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    B0: float = 0.0,
+    rho_IE: float = 0.0,
+    grid_step: float = 0.25,
+    max_grid_points: int = 2_000,
+) -> float:
+    """
+    Probability of defaulting within 12 months, computed by recursive
+    numerical integration instead of sampling.
+
+    Monthly net cash flow is Normal(mu_I - mu_E, s^2) with
+    s^2 = var_I + var_E - 2 * rho_IE * sigma_I * sigma_E, and debt obligations
+    are deterministic, so the cash balance is a Gaussian random walk. The
+    density of the balance on paths that have not yet defaulted is carried
+    forward month by month on a uniform grid over [0, U]; the mass that
+    crosses zero each month is the default probability for that month.
+
+    Parameters
+    ----------
+    mu_I .. rho_IE  : As in prob_default_12m.
+    grid_step       : Grid spacing as a fraction of the monthly std dev s.
+    max_grid_points : Upper bound on grid size; the step widens beyond it.
+
+    Returns
+    -------
+    float : Probability of default within 12 months.
+
+    Notes
+    -----
+    U is the worst expected 12-month drawdown plus 8 standard deviations;
+    mass above it cannot reach zero within the horizon and is dropped.
+    Integrals use Simpson's rule, so with the default grid the discretisation
+    error is below 1e-4 in probability (0.01 Shield Score points). Any
+    difference from prob_default_12m is that engine's sampling error, about
+    +/-0.2 points at N=200,000. Runtime is typically under a millisecond.
+    """
+    check_inputs(d, p, t, r, var_I, var_E, rho_IE)
+    if grid_step <= 0 or max_grid_points < 3:
+        raise ValueError("grid_step must be positive and max_grid_points >= 3.")
+
+    drift = (mu_I - mu_E) - debt_schedule(d, p, t, r).sum(axis=0)   # (12,)
+
+    var_net = var_I + var_E - 2.0 * rho_IE * math.sqrt(var_I * var_E)
+    s = math.sqrt(max(0.0, var_net))
+
+    if s < 1e-9:
+        return 1.0 if (B0 + np.cumsum(drift) < 0).any() else 0.0
+
+    U = np.maximum(-drift, 0.0).sum() + 8.0 * s * math.sqrt(len(drift))
+    h = grid_step * s
+    M = 2 * (int(U / (2 * h)) + 1) + 1
+    if M > max_grid_points:
+        M = max_grid_points - (1 - max_grid_points % 2)
+        h = U / (M - 1)
+
+    b = np.arange(M) * h
+    w = np.full(M, 2.0 * h / 3.0)        # Simpson weights: h/3 * [1, 4, 2, ..., 4, 1]
+    w[1::2] = 4.0 * h / 3.0
+    w[0] = w[-1] = h / 3.0
+
+    mean = B0 + drift[0]
+    prob = float(_norm_cdf(np.array(-mean / s)))
+    f = _norm_pdf((b - mean) / s) / s
+
+    for mu_m in drift[1:]:
+        g = w * f
+
+        # Nodes more than 9 s from the default boundary contribute 0 or g.
+        j_lo = min(M, max(0, math.floor((-mu_m - 9.0 * s) / h)))
+        j_hi = min(M, max(0, math.ceil((-mu_m + 9.0 * s) / h) + 1))
+        prob += float(g[:j_lo].sum())
+        prob += float(g[j_lo:j_hi] @ _norm_cdf(-(b[j_lo:j_hi] + mu_m) / s))
+
+        lag_lo = math.floor((mu_m - 9.0 * s) / h)
+        lag_hi = math.ceil((mu_m + 9.0 * s) / h)
+        if lag_lo > M - 1 or lag_hi < 1 - M:
+            break
+
+        lags = np.arange(lag_lo, lag_hi + 1)
+        kernel = _norm_pdf((lags * h - mu_m) / s) / s
+        c = np.convolve(g, kernel)
+
+        f = np.zeros(M)
+        i0 = max(0, lag_lo)
+        i1 = min(M, lag_lo + len(c))
+        f[i0:i1] = c[i0 - lag_lo:i1 - lag_lo]
+
+    return min(1.0, prob)
 
 
 def shield_score(
@@ -116,13 +863,349 @@ def shield_score(
     N: int = 200_000,
     rho_IE: float = 0.0,
     seed: int = 42,
+    method: str = "monte_carlo",
+    block_size: Optional[int] = None,
+    dtype=np.float64,
+    variance_reduction: Optional[str] = None,
 ) -> float:
     """
     Returns the Shield Score: (1 - prob_default_12m) * 100.
     Rounded to one decimal place, clamped to [0, 100].
+
+    method selects the engine: "monte_carlo" (N seeded trials),
+    "adaptive" (sequential batches up to N paths, see
+    prob_default_12m_adaptive) or "quadrature" (deterministic, N and seed
+    are ignored). block_size, dtype and variance_reduction are passed to
+    prob_default_12m.
     """
-    prob = prob_default_12m(
-        mu_I=mu_I, mu_E=mu_E, var_I=var_I, var_E=var_E,
-        d=d, p=p, t=t, r=r, B0=B0, N=N, rho_IE=rho_IE, seed=seed,
-    )
+    if method == "monte_carlo":
+        prob = prob_default_12m(
+            mu_I=mu_I, mu_E=mu_E, var_I=var_I, var_E=var_E,
+            d=d, p=p, t=t, r=r, B0=B0, N=N, rho_IE=rho_IE, seed=seed,
+            block_size=block_size, dtype=dtype,
+            variance_reduction=variance_reduction,
+        )
+    elif method == "adaptive":
+        prob = prob_default_12m_adaptive(
+            mu_I=mu_I, mu_E=mu_E, var_I=var_I, var_E=var_E,
+            d=d, p=p, t=t, r=r, B0=B0, rho_IE=rho_IE, seed=seed, max_N=N,
+        ).prob
+    elif method == "quadrature":
+        prob = prob_default_12m_quadrature(
+            mu_I=mu_I, mu_E=mu_E, var_I=var_I, var_E=var_E,
+            d=d, p=p, t=t, r=r, B0=B0, rho_IE=rho_IE,
+        )
+    else:
+        raise ValueError(f"Unknown scoring method: {method!r}.")
+    return score_from_prob(prob)
+
+
+def score_from_prob(prob: float) -> float:
+    """Shield Score for a default probability: rounded, clamped to [0, 100]."""
     return round(max(0.0, min(100.0, (1.0 - prob) * 100)), 1)
+
+
+# Cap on schedules x paths per block in prob_default_schedules: about
+# 25 MB for each (S, n, 12) float64 temporary.
+SCHEDULE_BLOCK_PATHS = 262_144
+
+
+def prob_default_schedules(mu_I, mu_E, var_I, var_E, required, B0, N, rho_IE, seed, block_size):
+    """
+    Default probability for S obligation schedules required (S, 12) and
+    starting balances B0 (S,), all evaluated on the same N seeded paths.
+    block_size is reduced so that S x block_size stays within
+    SCHEDULE_BLOCK_PATHS.
+    """
+    required = np.atleast_2d(np.asarray(required, dtype=float))
+    B0 = np.broadcast_to(np.asarray(B0, dtype=float), (len(required),))
+    obligations = np.cumsum(required, axis=1)                 # (S, 12)
+
+    # The (S, n, 12) temporary is the memory peak: shrink the block as S grows
+    block_size = max(256, min(block_size, SCHEDULE_BLOCK_PATHS // len(required)))
+
+    defaults = np.zeros(len(required), dtype=np.int64)
+    for C in _cash_blocks(mu_I, mu_E, var_I, var_E, np.zeros(12), N, rho_IE, seed,
+                          block_size, np.dtype(np.float64)):
+        running_min = (C[None, :, :] - obligations[:, None, :]).min(axis=2)   # (S, n)
+        defaults += (B0[:, None] + running_min < 0).sum(axis=1)
+
+    return defaults / N
+
+
+def prob_default_batch(
+    mu_I: float,
+    mu_E: float,
+    var_I: float,
+    var_E: float,
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    scenarios: list,
+    B0: float = 0.0,
+    N: int = 200_000,
+    rho_IE: float = 0.0,
+    seed: int = 42,
+    block_size: int = 16_384,
+) -> np.ndarray:
+    """
+    Default probability for each Scenario, using common random numbers.
+
+    Every scenario is evaluated on the same N paths in one vectorised pass,
+    so the draws are generated once and score differences between
+    scenarios carry far less noise than differences of independent runs.
+    Memory per block is S x block_size x 12 floats, with block_size cut so
+    that S x block_size stays within SCHEDULE_BLOCK_PATHS.
+
+    Returns
+    -------
+    np.ndarray : Shape (S,), one probability per scenario.
+    """
+    check_inputs(d, p, t, r, var_I, var_E, rho_IE)
+    if N <= 0 or block_size <= 0:
+        raise ValueError("N and block_size must be positive integers.")
+
+    required = np.empty((len(scenarios), 12))
+    start = np.empty(len(scenarios))
+
+    for i, sc in enumerate(scenarios):
+        payments = p if sc.payments is None else list(sc.payments)
+        if len(payments) != len(d):
+            raise ValueError("Scenario payments must have one entry per debt.")
+        required[i] = debt_schedule(d, payments, t, r).sum(axis=0)
+        if sc.extra_debt:
+            required[i] += debt_schedule(*(list(col) for col in zip(*sc.extra_debt))).sum(axis=0)
+        start[i] = B0 - sc.purchase
+
+    return prob_default_schedules(mu_I, mu_E, var_I, var_E, required, start,
+                                   N, rho_IE, seed, block_size)
+
+
+def shield_score_batch(
+    mu_I: float,
+    mu_E: float,
+    var_I: float,
+    var_E: float,
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    scenarios: list,
+    B0: float = 0.0,
+    N: int = 200_000,
+    rho_IE: float = 0.0,
+    seed: int = 42,
+) -> list[float]:
+    """Shield Score for each Scenario, all scored against the same paths."""
+    probs = prob_default_batch(
+        mu_I=mu_I, mu_E=mu_E, var_I=var_I, var_E=var_E, d=d, p=p, t=t, r=r,
+        scenarios=scenarios, B0=B0, N=N, rho_IE=rho_IE, seed=seed,
+    )
+    return [score_from_prob(float(prob)) for prob in probs]
+
+
+def debt_attribution(
+    mu_I: float,
+    mu_E: float,
+    var_I: float,
+    var_E: float,
+    d: list[float],
+    p: list[float],
+    t: list[float],
+    r: list[float],
+    B0: float = 0.0,
+    N: int = 200_000,
+    rho_IE: float = 0.0,
+    seed: int = 42,
+    extra_payment: float = 50.0,
+    block_size: int = 16_384,
+) -> dict:
+    """
+    How much each debt moves the Shield Score, from a single simulation.
+
+    The baseline, each leave-one-out schedule (debt i removed) and each
+    schedule with debt i's monthly payment raised by extra_payment are
+    2k + 1 obligation streams evaluated on the same paths, so per-debt
+    contributions are not swamped by sampling noise.
+
+    Returns
+    -------
+    dict : {"shield_score": baseline score,
+            "debts": [{"index", "score_without", "contribution",
+                       "score_with_extra_payment"}, ...]}
+           contribution is the score gained by removing that debt.
+    """
+    check_inputs(d, p, t, r, var_I, var_E, rho_IE)
+    if N <= 0 or block_size <= 0:
+        raise ValueError("N and block_size must be positive integers.")
+
+    per_debt = debt_schedule(d, p, t, r)            # (k, 12)
+    baseline = per_debt.sum(axis=0)
+    raised = debt_schedule(d, np.asarray(p, dtype=float) + extra_payment, t, r)
+
+    required = np.vstack([baseline, baseline - per_debt, baseline - per_debt + raised])
+    probs = prob_default_schedules(mu_I, mu_E, var_I, var_E, required, B0,
+                                    N, rho_IE, seed, block_size)
+    scores = [score_from_prob(float(prob)) for prob in probs]
+
+    k = len(d)
+    base_score = scores[0]
+    return {
+        "shield_score": base_score,
+        "debts": [
+            {
+                "index":                    i,
+                "score_without":            scores[1 + i],
+                "contribution":             round(scores[1 + i] - base_score, 1),
+                "score_with_extra_payment": scores[1 + k + i],
+            }
+            for i in range(k)
+        ],
+    }
+
+
+def aggregate_instalments(plans: list) -> tuple[list, list, list, list]:
+    """
+    Collapse 0% instalment plans (BNPL) into one debt per distinct schedule.
+
+    plans holds (monthly_amount, instalments_remaining) pairs. Plans with the
+    same number of instalments left have identical schedules, so their
+    amounts are summed into a single stream of d = amount * n, p = amount,
+    t = n, r = 0; at most one stream exists per distinct instalment count,
+    so scoring cost does not grow with the number of plans.
+
+    Returns
+    -------
+    (d, p, t, r) lists, ordered by instalments remaining.
+    """
+    by_term: dict = {}
+    for amount, n in plans:
+        if n <= 0 or amount <= 0:
+            continue
+        by_term[int(n)] = by_term.get(int(n), 0.0) + float(amount)
+
+    terms = sorted(by_term)
+    return (
+        [by_term[n] * n for n in terms],
+        [by_term[n] for n in terms],
+        [float(n) for n in terms],
+        [0.0] * len(terms),
+    )
+
+
+def pad_debts(debts: list) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stack per-user (d, p, t, r) debt lists into (U, K) arrays, K being the
+    largest debt count. Padding entries are zero-balance, zero-payment debts
+    and so contribute nothing to the schedule.
+    """
+    K = max([len(user_d) for user_d, _, _, _ in debts] + [1])
+    D = np.zeros((len(debts), K))
+    P = np.zeros((len(debts), K))
+    T = np.full((len(debts), K), math.inf)
+    R = np.zeros((len(debts), K))
+    for u, (user_d, user_p, user_t, user_r) in enumerate(debts):
+        k = len(user_d)
+        D[u, :k], P[u, :k], T[u, :k], R[u, :k] = user_d, user_p, user_t, user_r
+    return D, P, T, R
+
+
+def prob_default_cohort(
+    mu_I,
+    mu_E,
+    var_I,
+    var_E,
+    D: np.ndarray,
+    P: np.ndarray,
+    T: np.ndarray,
+    R: np.ndarray,
+    B0=0.0,
+    rho_IE=0.0,
+    N: int = 200_000,
+    seed: int = 42,
+    block_size: int = 16_384,
+    user_chunk: int = 32,
+) -> np.ndarray:
+    """
+    12-month default probability for U users in one vectorised pass over a
+    shared set of draws.
+
+    Parameters
+    ----------
+    mu_I, mu_E, var_I, var_E, B0, rho_IE : Per-user arrays of shape (U,), or
+                 scalars shared by every user. B0 may also be (U, G): G
+                 starting balances per user, all priced on the same paths
+                 (e.g. savings after each of G purchases).
+    D, P, T, R : (U, K) padded debt matrices, e.g. from pad_debts.
+    N, seed    : Paths and seed; every user is scored on the same draws as
+                 prob_default_12m with that N and seed (including the
+                 attached draw pool), so results match per-user scoring.
+    block_size : Paths per block.
+    user_chunk : Users evaluated together per block; memory is about
+                 user_chunk x block_size x 12 floats.
+
+    Returns
+    -------
+    np.ndarray : Shape (U,), one default probability per user, or (U, G)
+                 when B0 is (U, G).
+
+    Notes
+    -----
+    Net cash flow is mu + alpha * Z1 + beta * Z2 per month, with
+    alpha = sigma_I - rho * sigma_E and beta = -sigma_E * sqrt(1 - rho^2),
+    so the cumulative sums of Z1 and Z2 are computed once per block and
+    each user costs only a scaled sum, a subtraction and a running minimum.
+    """
+    U = len(D)
+    if not (np.shape(D) == np.shape(P) == np.shape(T) == np.shape(R)):
+        raise ValueError("D, P, T and R must all have the same shape.")
+    B0 = np.asarray(B0, dtype=float)
+    levels = B0.ndim == 2
+    try:
+        mu_I, mu_E, var_I, var_E, rho_IE = (
+            np.broadcast_to(np.asarray(x, dtype=float), (U,))
+            for x in (mu_I, mu_E, var_I, var_E, rho_IE))
+        B0 = np.broadcast_to(B0, (U, B0.shape[1]) if levels else (U,))
+    except ValueError:
+        raise ValueError("Per-user parameters must be scalars or have one entry per user.")
+
+    if (var_I < 0).any() or (var_E < 0).any():
+        raise ValueError("Variances must be non-negative.")
+    if ((rho_IE < -1.0) | (rho_IE > 1.0)).any():
+        raise ValueError("rho_IE must be in [-1, 1].")
+    if N <= 0 or block_size <= 0 or user_chunk <= 0:
+        raise ValueError("N, block_size and user_chunk must be positive integers.")
+
+    sigma_I = np.sqrt(var_I)
+    sigma_E = np.sqrt(var_E)
+    alpha = sigma_I - rho_IE * sigma_E
+    beta = -sigma_E * np.sqrt(np.maximum(0.0, 1.0 - rho_IE**2))
+
+    months = np.arange(1, 13)
+    required = debt_schedule(D, P, T, R).sum(axis=1)                         # (U, 12)
+    drift = (mu_I - mu_E)[:, None] * months - np.cumsum(required, axis=1)   # (U, 12)
+
+    defaults = np.zeros(B0.shape, dtype=np.int64)
+    for Z in _draw_blocks(N, 12, seed, block_size, np.dtype(np.float64)):
+        S1 = np.cumsum(Z[..., 0], axis=1)   # (n, 12)
+        S2 = np.cumsum(Z[..., 1], axis=1)
+        for lo in range(0, U, user_chunk):
+            hi = min(U, lo + user_chunk)
+            C = (alpha[lo:hi, None, None] * S1 + beta[lo:hi, None, None] * S2
+                 + drift[lo:hi, None, :])                                    # (u, n, 12)
+            if levels:
+                # Sorted minima count every balance with one search, as in ScoreSurface
+                minima = np.sort(C.min(axis=2), axis=1)
+                for u in range(lo, hi):
+                    defaults[u] += np.searchsorted(minima[u - lo], -B0[u], side="left")
+            else:
+                defaults[lo:hi] += (B0[lo:hi, None] + C.min(axis=2) < 0).sum(axis=1)
+
+    return defaults / N
+
+
+def shield_score_cohort(*args, **kwargs) -> list[float]:
+    """Shield Score per user; arguments as prob_default_cohort."""
+    return [score_from_prob(float(prob)) for prob in prob_default_cohort(*args, **kwargs)]
+